@@ -0,0 +1,344 @@
+"""Benchmark: the coordinator push tick and the update entity against a stand-in hass.
+
+Runs CYDSolarCoordinator._async_update_data and
+CYDSolarUpdateEntity.installed_version against fake_hass.FakeHass for
+populations of 10, 1k and 10k entities and 1, 8 and 32 displays (one config
+entry per display). Reported per scenario:
+
+- tick p50/p95: one warm tick (resolvers cached) in microseconds
+- cold p50: one tick with both resolvers invalidated (registry/service scan)
+- alloc: peak traced memory allocated during one warm tick in KiB
+- retained: traced memory still held after all rounds in KiB (leaks, unbounded caches)
+- setup: traced memory of the coordinators and update entities in KiB
+- version: one read of installed_version in nanoseconds
+
+Run from the repository root (requires Home Assistant to be installed):
+
+    python benchmarks/bench_coordinator.py                  # print the table
+    python benchmarks/bench_coordinator.py --save-baseline  # store benchmarks/baseline.json
+    python benchmarks/bench_coordinator.py --check          # exit 1 on a regression
+
+Timings are compared relative to a fixed calibration workload measured in the
+same run, which evens out machine speed and frequency scaling; still, save a
+baseline on the machine you compare on before changing the coordinator.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import timeit
+import tracemalloc
+from types import MappingProxyType
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.fake_hass import FakeConfigEntry, FakeHass  # noqa: E402
+from custom_components.cyd_solar_display.const import (  # noqa: E402
+    CONF_HOST,
+    CONF_PUSH_MODE,
+    DOMAIN,
+    PUSH_MODE_EVENT,
+)
+from custom_components.cyd_solar_display.coordinator import CYDSolarCoordinator  # noqa: E402
+from custom_components.cyd_solar_display.slots import (  # noqa: E402
+    CUSTOM_SLOTS,
+    FLOAT_SLOTS,
+    PAGE_SLOTS,
+)
+from custom_components.cyd_solar_display.update import CYDSolarUpdateEntity  # noqa: E402
+
+POPULATIONS = (10, 1000, 10000)
+DISPLAYS = (1, 8, 32)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Allowed growth before --check fails; timings are noisier than memory
+TIME_METRICS = ("tick_p50_us", "tick_p95_us", "cold_p50_us", "version_ns")
+MEMORY_METRICS = ("alloc_kib", "retained_kib", "setup_kib")
+# Absolute growth always allowed, figures this small are dominated by noise
+SLACK = {"version_ns": 250, "alloc_kib": 4, "retained_kib": 4, "setup_kib": 4}
+
+# Source values changed before every round, so deltas are actually sent
+CHANGED_PER_ROUND = 5
+
+# Minimum number of timed ticks per scenario
+MIN_SAMPLES = 400
+
+
+def populate(hass, population, displays):
+    """Fill the fake hass with background entities and the ESPHome side of each display."""
+    # Background entities, spread over a few integrations with a service each
+    for idx in range(population):
+        entry_id = f"other_{idx % 50}"
+        entity_id = f"sensor.background_{idx}"
+        hass.states.async_set(entity_id, str(idx % 977 * 1.5), {"unit_of_measurement": "W"})
+        hass.entity_registry.async_add(entity_id, entry_id)
+    for idx in range(max(1, population // 20)):
+        hass.services.async_register(f"domain_{idx % 25}", f"service_{idx}")
+
+    for num in range(displays):
+        name = f"cyd-solar-display-{num}"
+        host = f"192.168.10.{num + 1}"
+        esphome_entry = FakeConfigEntry(
+            entry_id=f"esphome_{num}",
+            domain="esphome",
+            title=f"CYD Solar Display {num}",
+            data=MappingProxyType({"host": host, "name": name}),
+        )
+        hass.config_entries.async_add(esphome_entry)
+
+        device = name.replace("-", "_")
+        update_id = f"update.{device}_firmware"
+        sensor_id = f"sensor.{device}_firmware_version"
+        hass.states.async_set(update_id, "off", {"installed_version": "1.2.8", "latest_version": "1.2.8"})
+        hass.states.async_set(sensor_id, "1.2.8")
+        for entity_id in (update_id, sensor_id, f"sensor.{device}_wifi_signal", f"switch.{device}_backlight"):
+            hass.entity_registry.async_add(entity_id, esphome_entry.entry_id)
+
+        hass.services.async_register("esphome", f"{device}_update_display")
+        hass.services.async_register("esphome", f"{device}_update_display_delta")
+        hass.services.async_register("esphome", f"{device}_trigger_ota_update")
+
+
+def display_options(num):
+    """Options of one display: all energy values, all custom slots, five pages, event mode."""
+    # Event mode is opt-in since the poll default; the saved baseline measures event mode
+    options = {CONF_PUSH_MODE: PUSH_MODE_EVENT}
+    for idx, (_key, option) in enumerate(FLOAT_SLOTS):
+        options[option] = f"sensor.display_{num}_energy_{idx}"
+    for idx, name_option, entity_option, _default in CUSTOM_SLOTS:
+        options[name_option] = f"Sensor {idx}"
+        options[entity_option] = f"sensor.display_{num}_custom_{idx}"
+    for _page, option, default in PAGE_SLOTS:
+        options[option] = default
+    return options
+
+
+def source_entity_ids(options):
+    """Return the source entities configured in options."""
+    return [value for key, value in options.items() if key.endswith("_entity")]
+
+
+async def async_setup_displays(hass, displays):
+    """Create one coordinator and update entity per display, after one warm-up tick each."""
+    coordinators = []
+    entities = []
+    for num in range(displays):
+        options = display_options(num)
+        for idx, entity_id in enumerate(source_entity_ids(options)):
+            hass.states.async_set(entity_id, str(idx * 10.5), {"unit_of_measurement": "W"})
+        entry = FakeConfigEntry(
+            entry_id=f"cyd_{num}",
+            domain=DOMAIN,
+            title=f"CYD Solar {num}",
+            data=MappingProxyType({CONF_HOST: f"192.168.10.{num + 1}"}),
+            options=MappingProxyType(options),
+        )
+        hass.config_entries.async_add(entry)
+
+        coordinator = CYDSolarCoordinator(hass, entry)
+        # Ticks are driven by the benchmark, not by the refresh timer
+        coordinator._unsub_dummy()
+        coordinator.data = await coordinator._async_update_data()
+        # The first tick hands its pushes over without waiting for them
+        await hass.async_block_till_done()
+        coordinators.append(coordinator)
+
+        entity = CYDSolarUpdateEntity(
+            coordinator=coordinator,
+            entry=entry,
+            target_host=entry.data[CONF_HOST],
+            unique_id=f"{entry.entry_id}_update",
+            title="CYD Solar Firmware",
+            device_id=entry.entry_id,
+        )
+        entity.hass = hass
+        entity.entity_id = f"update.cyd_solar_{num}_firmware"
+        await entity.async_added_to_hass()
+        entities.append(entity)
+    return coordinators, entities
+
+
+def change_sources(hass, coordinators, round_num):
+    """Change a few source values of every display (outside the timed region)."""
+    for coordinator in coordinators:
+        for entity_id in coordinator.tracked_entity_ids[:CHANGED_PER_ROUND]:
+            hass.states.async_set(entity_id, str(round_num % 1000 + 0.5), {"unit_of_measurement": "W"})
+
+
+async def async_timed_round(coordinators, samples, cold=False):
+    """Tick every coordinator once, appending the duration of each tick to samples."""
+    for coordinator in coordinators:
+        if cold:
+            coordinator.device_resolver.invalidate()
+            coordinator.target_resolver.invalidate()
+        started = time.perf_counter()
+        coordinator.data = await coordinator._async_update_data()
+        samples.append(time.perf_counter() - started)
+
+
+async def async_run_scenario(population, displays, rounds, repeats):
+    """Run one scenario and return its metrics."""
+    hass = FakeHass()
+    populate(hass, population, displays)
+    calibration = calibrate()
+
+    gc.collect()
+    tracemalloc.start()
+    before_setup = tracemalloc.get_traced_memory()[0]
+    coordinators, entities = await async_setup_displays(hass, displays)
+    gc.collect()
+    setup_bytes = tracemalloc.get_traced_memory()[0] - before_setup
+
+    # Allocations per warm tick and what stays behind after all rounds
+    alloc = []
+    before_rounds = tracemalloc.get_traced_memory()[0]
+    for round_num in range(rounds):
+        change_sources(hass, coordinators, round_num)
+        for coordinator in coordinators:
+            tracemalloc.reset_peak()
+            start, _peak = tracemalloc.get_traced_memory()
+            coordinator.data = await coordinator._async_update_data()
+            _current, peak = tracemalloc.get_traced_memory()
+            alloc.append(peak - start)
+    gc.collect()
+    retained_bytes = tracemalloc.get_traced_memory()[0] - before_rounds
+    tracemalloc.stop()
+
+    # Latency without tracemalloc overhead; the best of `repeats` passes, like timeit
+    timings = [await async_measure_latency(hass, coordinators, rounds) for _ in range(repeats)]
+
+    number = 20000
+    entity = entities[0]
+    version_total = min(timeit.repeat(lambda: entity.installed_version, number=number, repeat=5))
+    assert entity.installed_version == "1.2.8", entity.installed_version
+
+    return {
+        **{metric: min(timing[metric] for timing in timings) for metric in timings[0]},
+        "alloc_kib": round(statistics.median(alloc) / 1024, 1),
+        "retained_kib": round(retained_bytes / 1024, 1),
+        "setup_kib": round(setup_bytes / 1024, 1),
+        "version_ns": round(version_total / number * 1e9, 1),
+        "calibration_us": min(calibration, calibrate()),
+        "service_calls": hass.services.calls,
+    }
+
+
+async def async_measure_latency(hass, coordinators, rounds):
+    """Time warm and cold ticks with GC paused, returns p50/p95 and the cold p50."""
+    # At least MIN_SAMPLES ticks so p95 is not decided by a single outlier
+    warm = []
+    cold = []
+    timed_rounds = max(rounds, -(-MIN_SAMPLES // len(coordinators)))
+    gc.collect()
+    gc.disable()
+    try:
+        for round_num in range(timed_rounds):
+            change_sources(hass, coordinators, round_num)
+            await async_timed_round(coordinators, warm)
+        for round_num in range(max(1, timed_rounds // 5)):
+            change_sources(hass, coordinators, round_num)
+            await async_timed_round(coordinators, cold, cold=True)
+    finally:
+        gc.enable()
+
+    warm.sort()
+    return {
+        "tick_p50_us": round(statistics.median(warm) * 1e6, 1),
+        "tick_p95_us": round(warm[min(len(warm) - 1, int(len(warm) * 0.95))] * 1e6, 1),
+        "cold_p50_us": round(statistics.median(cold) * 1e6, 1),
+    }
+
+
+def calibrate():
+    """Time a fixed pure-Python workload in microseconds, the yardstick for machine speed."""
+
+    def workload():
+        frame = {f"key_{idx}": str(idx * 1.5) for idx in range(200)}
+        return sorted(frame.items(), key=lambda item: item[1])
+
+    return round(min(timeit.repeat(workload, number=200, repeat=5)) / 200 * 1e6, 1)
+
+
+def scenario_name(population, displays):
+    """Return the key of a scenario in the results and the baseline."""
+    return f"{population}e/{displays}d"
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    """Return the regressions of results against baseline as readable lines.
+
+    Timings are scaled by the calibration ratio first, so a slower (or
+    throttled) machine does not count as a regression of the coordinator.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        speed = metrics["calibration_us"] / reference["calibration_us"] if reference.get("calibration_us") else 1.0
+        for metric in (*TIME_METRICS, *MEMORY_METRICS):
+            if metric not in reference:
+                continue
+            if metric in TIME_METRICS:
+                tolerance = time_tolerance
+                limit = reference[metric] * speed * (1 + tolerance)
+            else:
+                tolerance = memory_tolerance
+                limit = reference[metric] * (1 + tolerance)
+            limit = max(limit, reference[metric] + SLACK.get(metric, 0))
+            if metrics[metric] > limit:
+                regressions.append(
+                    f"{name} {metric}: {metrics[metric]} > {round(limit, 1)} (baseline {reference[metric]}, +{tolerance:.0%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50, help="ticks per display and scenario")
+    parser.add_argument("--repeats", type=int, default=3, help="latency passes per scenario, the best one counts")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if a metric regressed past the baseline")
+    parser.add_argument("--time-tolerance", type=float, default=1.0, help="allowed timing growth (1.0 = +100%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.2, help="allowed memory growth (0.2 = +20%%)")
+    args = parser.parse_args()
+
+    results = {}
+    header = f"{'scenario':<12}" + "".join(f"{metric:>14}" for metric in (*TIME_METRICS, *MEMORY_METRICS))
+    print(header)
+    for population in POPULATIONS:
+        for displays in DISPLAYS:
+            name = scenario_name(population, displays)
+            metrics = asyncio.run(async_run_scenario(population, displays, args.rounds, args.repeats))
+            results[name] = metrics
+            print(f"{name:<12}" + "".join(f"{metrics[metric]:>14}" for metric in (*TIME_METRICS, *MEMORY_METRICS)))
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fp:
+            json.dump(results, fp, indent=2, sort_keys=True)
+            fp.write("\n")
+        print(f"Baseline written to {args.baseline}")
+
+    if args.check:
+        try:
+            with open(args.baseline, encoding="utf-8") as fp:
+                baseline = json.load(fp)
+        except FileNotFoundError:
+            sys.exit(f"No baseline at {args.baseline}, run with --save-baseline first")
+        regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
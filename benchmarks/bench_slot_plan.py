@@ -0,0 +1,142 @@
+"""Micro-benchmark: per-tick frame building, legacy closures vs. compiled slot plan.
+
+Run from the repository root (requires Home Assistant to be installed):
+
+    python benchmarks/bench_slot_plan.py
+"""
+import os
+import sys
+import timeit
+from datetime import datetime
+from types import MappingProxyType
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from custom_components.cyd_solar_display.slots import (  # noqa: E402
+    CUSTOM_SLOTS,
+    FLOAT_SLOTS,
+    PAGE_SLOTS,
+    SlotPlan,
+)
+
+STATE_UNAVAILABLE = "unavailable"
+STATE_UNKNOWN = "unknown"
+
+
+class FakeState:
+    """Minimal stand-in for homeassistant.core.State."""
+
+    __slots__ = ("state", "attributes")
+
+    def __init__(self, state, attributes=None):
+        self.state = state
+        self.attributes = attributes or {}
+
+
+def make_fixture():
+    """Options and states with all 11 energy values and 28 custom slots populated."""
+    options = {}
+    states = {}
+    for idx, (_key, option) in enumerate(FLOAT_SLOTS):
+        entity_id = f"sensor.energy_{idx}"
+        options[option] = entity_id
+        states[entity_id] = FakeState(str(1234.56 + idx), {"unit_of_measurement": "W"})
+    for idx, name_option, entity_option, _default in CUSTOM_SLOTS:
+        entity_id = f"sensor.custom_{idx}"
+        options[name_option] = f"Sensor {idx}"
+        options[entity_option] = entity_id
+        states[entity_id] = FakeState(str(idx * 1.5), {"unit_of_measurement": "°C"})
+    for _page, option, _default in PAGE_SLOTS:
+        options[option] = True
+    return MappingProxyType(options), states
+
+
+def legacy_frame(options, states):
+    """The pre-slot-plan tick: nested closures, per-key option lookups, two dicts."""
+
+    def get_value(entity_id):
+        if not entity_id:
+            return None
+        state = states.get(entity_id)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return None
+        try:
+            return round(float(state.state), 1)
+        except (ValueError, TypeError):
+            return None
+
+    def get_custom_val(entity_id):
+        if not entity_id:
+            return ""
+        state = states.get(entity_id)
+        if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            return "--"
+        val = state.state
+        try:
+            fval = float(val)
+            if fval.is_integer():
+                val = f"{int(fval)}"
+            else:
+                val = f"{round(fval, 2)}"
+        except ValueError:
+            pass
+        unit = state.attributes.get("unit_of_measurement", "")
+        return f"{val} {unit}".strip()
+
+    payload = {key: get_value(options.get(option)) for key, option in FLOAT_SLOTS}
+    payload["timestamp"] = datetime.now().isoformat()
+    for idx, name_option, entity_option, default_name in CUSTOM_SLOTS:
+        payload[f"c{idx}_n"] = options.get(name_option, default_name)
+        payload[f"c{idx}_v"] = get_custom_val(options.get(entity_option))
+
+    enabled = {page: options.get(option, default) for page, option, default in PAGE_SLOTS}
+    enabled_pages = [page for page, on in enabled.items() if on] or [1]
+
+    service_data = {key: float(payload[key] or 0.0) for key, _option in FLOAT_SLOTS}
+    service_data["page_num"] = 1
+    service_data["auto_rotate"] = False
+    service_data["page_idx"] = 1
+    service_data["page_total"] = len(enabled_pages)
+    service_data["show_kw"] = bool(options.get("show_kw", False))
+    for idx, *_rest in CUSTOM_SLOTS:
+        service_data[f"c{idx}_n"] = str(payload[f"c{idx}_n"] or " ")
+        service_data[f"c{idx}_v"] = str(payload[f"c{idx}_v"] or " ")
+    service_data["dim_start"] = int(options.get("dim_start_time", 22))
+    service_data["dim_end"] = int(options.get("dim_end_time", 6))
+    service_data["dim_brt"] = float(options.get("dim_brightness", 20.0))
+    for page, on in enabled.items():
+        service_data[f"p{page}_en"] = bool(on)
+    return service_data
+
+
+def slot_plan_frame(plan, states):
+    """The compiled tick: one pass over the plan."""
+    frame = plan.build(states)
+    frame["page_num"] = 1
+    frame["page_idx"] = 1
+    return frame
+
+
+def main():
+    options, states = make_fixture()
+    plan = SlotPlan(options)
+
+    legacy = legacy_frame(options, states)
+    compiled = slot_plan_frame(plan, states)
+    assert legacy == compiled, "slot plan frame differs from the legacy frame"
+
+    number = 20000
+    results = {
+        "legacy closures": timeit.timeit(lambda: legacy_frame(options, states), number=number),
+        "slot plan": timeit.timeit(lambda: slot_plan_frame(plan, states), number=number),
+        "slot plan compile": timeit.timeit(lambda: SlotPlan(options), number=number),
+    }
+
+    print(f"{len(plan.slots)} live slots, {len(compiled)} frame keys, {number} iterations")
+    for name, total in results.items():
+        print(f"  {name:<18} {total / number * 1e6:8.2f} us/tick")
+    print(f"  speed-up           {results['legacy closures'] / results['slot plan']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark: how long the integration holds up Home Assistant startup.
+
+Runs async_setup and async_setup_entry of the integration against
+fake_hass.FakeHass for 1, 8 and 32 displays, with a slow GitHub (the version
+check) and slow displays (the ESPHome service calls). The restart case is
+modelled: the source entities have not reported yet and the frame store holds
+the frames of the previous run. Reported per scenario:
+
+- async_setup: registration of views, static path, panel and services in ms
+- setup p50/max: one async_setup_entry in ms
+- first frame: from the start of async_setup until the last display got its
+  first push, in ms
+
+Run from the repository root (requires Home Assistant to be installed):
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --github-latency 30 --display-latency 500
+    python benchmarks/bench_startup.py --check   # exit 1 if a setup exceeds --budget
+"""
+import argparse
+import asyncio
+import gc
+import os
+import statistics
+import sys
+import time
+from types import MappingProxyType
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from homeassistant.components import panel_custom  # noqa: E402
+
+from benchmarks.bench_coordinator import display_options, populate  # noqa: E402
+from benchmarks.fake_hass import FakeConfigEntry, FakeHass, FakeServiceRegistry  # noqa: E402
+from custom_components import cyd_solar_display as integration  # noqa: E402
+from custom_components.cyd_solar_display.const import CONF_HOST, DOMAIN  # noqa: E402
+from custom_components.cyd_solar_display.coordinator import frame_store  # noqa: E402
+from custom_components.cyd_solar_display.version import FirmwareVersionService  # noqa: E402
+
+DISPLAYS = (1, 8, 32)
+POPULATION = 1000
+
+
+class TimedESPHome(FakeServiceRegistry):
+    """Service registry that notes the first push per display."""
+
+    def __init__(self, loop):
+        """Initialize."""
+        super().__init__()
+        self.loop = loop
+        self.first_push = {}
+
+    async def async_call(self, domain, service, service_data=None, blocking=False, **kwargs):
+        """Note the first push, then answer after the configured latency."""
+        if domain == "esphome":
+            self.first_push.setdefault(service, self.loop.time())
+        await super().async_call(domain, service, service_data, blocking, **kwargs)
+
+
+async def async_run_scenario(displays, github_latency, display_latency):
+    """Set up one entry per display and return the timings."""
+    loop = asyncio.get_running_loop()
+    hass = FakeHass()
+    hass.services = TimedESPHome(loop)
+    populate(hass, POPULATION, displays)
+    hass.services.latency = display_latency
+
+    entries = []
+    for num in range(displays):
+        entry = FakeConfigEntry(
+            entry_id=f"cyd_{num}",
+            domain=DOMAIN,
+            title=f"CYD Solar {num}",
+            data=MappingProxyType({CONF_HOST: f"192.168.10.{num + 1}"}),
+            options=MappingProxyType(display_options(num)),
+        )
+        hass.config_entries.async_add(entry)
+        entries.append(entry)
+        # Frames of the previous run, the sources have not reported yet
+        service = f"cyd_solar_display_{num}_update_display"
+        await frame_store(hass, entry.entry_id).async_save({"frames": {service: {"solar": 1234.5, "page_num": 1}}})
+
+    async def slow_fetch(_service):
+        await asyncio.sleep(github_latency)
+        return False
+
+    # A full collection scans every object of the process, HA and the test setup included;
+    # freeze that heap so a collection during the run only costs what the scenario allocated
+    gc.collect()
+    gc.freeze()
+
+    setup_times = []
+    with patch.object(panel_custom, "async_register_panel", return_value=None), patch.object(
+        FirmwareVersionService, "_async_fetch", slow_fetch
+    ):
+        started = loop.time()
+        await integration.async_setup(hass, {})
+        setup_done = loop.time()
+        for entry in entries:
+            entry_started = time.perf_counter()
+            assert await integration.async_setup_entry(hass, entry)
+            setup_times.append(time.perf_counter() - entry_started)
+
+        # Wait for the first push to every display, not for the version check
+        deadline = loop.time() + github_latency + display_latency * 10 + 5
+        while len(hass.services.first_push) < displays and loop.time() < deadline:
+            await asyncio.sleep(0.001)
+
+    gc.unfreeze()
+    first_frame = max(hass.services.first_push.values(), default=None)
+    return {
+        "async_setup_ms": round((setup_done - started) * 1000, 2),
+        "setup_p50_ms": round(statistics.median(setup_times) * 1000, 2),
+        "setup_max_ms": round(max(setup_times) * 1000, 2),
+        "first_frame_ms": None if first_frame is None else round((first_frame - started) * 1000, 1),
+        "pushed": len(hass.services.first_push),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--github-latency", type=float, default=5.0, help="version check latency in s")
+    parser.add_argument("--display-latency", type=float, default=200.0, help="ESPHome service latency in ms")
+    parser.add_argument("--budget", type=float, default=50.0, help="allowed async_setup_entry time in ms")
+    parser.add_argument("--check", action="store_true", help="exit 1 if a setup exceeds the budget")
+    args = parser.parse_args()
+
+    columns = ("async_setup_ms", "setup_p50_ms", "setup_max_ms", "first_frame_ms", "pushed")
+    print(f"{'displays':<10}" + "".join(f"{column:>16}" for column in columns))
+    over_budget = []
+    for displays in DISPLAYS:
+        result = asyncio.run(async_run_scenario(displays, args.github_latency, args.display_latency / 1000))
+        print(f"{displays:<10}" + "".join(f"{str(result[column]):>16}" for column in columns))
+        if result["setup_max_ms"] > args.budget or result["pushed"] < displays:
+            over_budget.append(displays)
+
+    if args.check:
+        if over_budget:
+            print(f"Setup over the {args.budget} ms budget or displays without a frame: {over_budget}")
+            sys.exit(1)
+        print(f"Every setup within {args.budget} ms, every display got a frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""Lightweight in-process stand-in for Home Assistant, for the offline benchmarks.
+
+Only the parts the coordinator, the resolvers, the update entity and the
+setup path touch are modelled: state machine, entity registry, config entries,
+service registry, bus, HTTP registration and the task helpers. Lookups are
+indexed the way Home Assistant indexes them, so a benchmark scales with the
+population like a real instance would.
+"""
+import asyncio
+import os
+import tempfile
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from homeassistant.core import CoreState
+from homeassistant.helpers import entity_registry as er
+
+
+class FakeState:
+    """Minimal stand-in for homeassistant.core.State."""
+
+    __slots__ = ("entity_id", "state", "attributes")
+
+    def __init__(self, entity_id, state, attributes=None):
+        self.entity_id = entity_id
+        self.state = state
+        self.attributes = attributes or {}
+
+
+class FakeStateMachine:
+    """Dict-backed state machine."""
+
+    def __init__(self):
+        """Initialize."""
+        self._states = {}
+
+    def get(self, entity_id):
+        """Return the state of an entity or None."""
+        return self._states.get(entity_id)
+
+    def async_set(self, entity_id, state, attributes=None):
+        """Set the state of an entity (no events are fired)."""
+        self._states[entity_id] = FakeState(entity_id, state, attributes)
+
+    def async_remove(self, entity_id):
+        """Remove an entity (no events are fired)."""
+        return self._states.pop(entity_id, None) is not None
+
+    def async_entity_ids(self):
+        """Return all entity ids."""
+        return list(self._states)
+
+
+@dataclass(frozen=True)
+class FakeRegistryEntry:
+    """Minimal stand-in for entity_registry.RegistryEntry."""
+
+    entity_id: str
+    config_entry_id: str | None
+
+    @property
+    def domain(self):
+        """Return the entity domain."""
+        return self.entity_id.partition(".")[0]
+
+
+class FakeEntityIndex:
+    """The entities container of the registry, indexed by config entry."""
+
+    def __init__(self):
+        """Initialize."""
+        self._entries = {}
+        self._by_config_entry = {}
+
+    def add(self, entry):
+        """Add a registry entry."""
+        self._entries[entry.entity_id] = entry
+        self._by_config_entry.setdefault(entry.config_entry_id, []).append(entry)
+
+    def get(self, entity_id):
+        """Return the registry entry of an entity or None."""
+        return self._entries.get(entity_id)
+
+    def get_entries_for_config_entry_id(self, config_entry_id):
+        """Return the registry entries of a config entry."""
+        return list(self._by_config_entry.get(config_entry_id, ()))
+
+    def __len__(self):
+        """Return the number of registered entities."""
+        return len(self._entries)
+
+
+class FakeEntityRegistry:
+    """Stand-in for the entity registry, found by er.async_get via hass.data."""
+
+    def __init__(self):
+        """Initialize."""
+        self.entities = FakeEntityIndex()
+
+    def async_get(self, entity_id):
+        """Return the registry entry of an entity or None."""
+        return self.entities.get(entity_id)
+
+    def async_add(self, entity_id, config_entry_id=None):
+        """Register an entity."""
+        self.entities.add(FakeRegistryEntry(entity_id, config_entry_id))
+
+
+@dataclass
+class FakeConfigEntry:
+    """Minimal stand-in for homeassistant.config_entries.ConfigEntry."""
+
+    entry_id: str
+    domain: str
+    title: str
+    data: MappingProxyType
+    options: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    pref_disable_polling: bool = False
+    update_listeners: list = field(default_factory=list)
+    on_unload: list = field(default_factory=list)
+
+    def async_on_unload(self, func):
+        """Remember a callback to run on unload."""
+        self.on_unload.append(func)
+
+    def add_update_listener(self, listener):
+        """Register an options listener, returns the unsubscribe callback."""
+        self.update_listeners.append(listener)
+        return lambda: self.update_listeners.remove(listener)
+
+    def async_create_background_task(self, hass, target, name, eager_start=True):
+        """Run a background task bound to the entry."""
+        return hass.async_create_background_task(target, name, eager_start)
+
+
+class FakeConfigEntries:
+    """Config entries indexed by domain."""
+
+    def __init__(self):
+        """Initialize."""
+        self._by_domain = {}
+        self.forwarded = {}
+
+    def async_add(self, entry):
+        """Add a config entry."""
+        self._by_domain.setdefault(entry.domain, []).append(entry)
+
+    def async_entries(self, domain=None):
+        """Return the entries of a domain (or all of them)."""
+        if domain is None:
+            return [entry for entries in self._by_domain.values() for entry in entries]
+        return list(self._by_domain.get(domain, ()))
+
+    def async_get_entry(self, entry_id):
+        """Return a config entry by id or None."""
+        for entry in self.async_entries():
+            if entry.entry_id == entry_id:
+                return entry
+        return None
+
+    async def async_forward_entry_setups(self, entry, platforms):
+        """Record the forwarded platforms (entities are not set up)."""
+        self.forwarded.setdefault(entry.entry_id, []).extend(platforms)
+
+    def async_update_entry(self, entry, *, options=None, data=None, title=None):
+        """Replace options/data/title like Home Assistant does."""
+        if options is not None:
+            entry.options = MappingProxyType(dict(options))
+        if data is not None:
+            entry.data = MappingProxyType(dict(data))
+        if title is not None:
+            entry.title = title
+        return True
+
+
+class FakeServiceRegistry:
+    """Service registry whose calls only count and yield once to the loop."""
+
+    def __init__(self):
+        """Initialize."""
+        self._services = {}
+        self.calls = 0
+        self.latency = 0.0
+
+    def async_register(self, domain, service, service_func=None, schema=None, supports_response=None):
+        """Register a service, the handler is never called."""
+        self._services.setdefault(domain, {})[service] = service_func
+
+    def async_services(self):
+        """Return a copy of all services, like Home Assistant does."""
+        return {domain: services.copy() for domain, services in self._services.items()}
+
+    def has_service(self, domain, service):
+        """Return True if the service exists."""
+        return service in self._services.get(domain, ())
+
+    async def async_call(self, domain, service, service_data=None, blocking=False, **kwargs):
+        """Count the call; blocking calls yield to the loop like a real dispatch."""
+        self.calls += 1
+        if blocking:
+            await asyncio.sleep(self.latency)
+
+
+class FakeBus:
+    """Event bus that only hands out unsubscribe callbacks (nothing is ever fired)."""
+
+    def __init__(self):
+        """Initialize."""
+        self.listeners = 0
+
+    def async_listen(self, event_type, listener, *args, **kwargs):
+        """Register a listener, returns the unsubscribe callback."""
+        self.listeners += 1
+
+        def remove():
+            self.listeners -= 1
+
+        return remove
+
+    async_listen_once = async_listen
+
+    def async_fire(self, event_type, event_data=None, *args, **kwargs):
+        """Drop the event."""
+
+
+class FakeHTTP:
+    """Records the registered views and static paths."""
+
+    def __init__(self):
+        """Initialize."""
+        self.views = []
+        self.static_paths = []
+
+    def register_view(self, view):
+        """Register an API view."""
+        self.views.append(view)
+
+    async def async_register_static_paths(self, configs):
+        """Register static paths."""
+        self.static_paths.extend(configs)
+
+
+class FakeConfig:
+    """Config paths below a temporary directory."""
+
+    def __init__(self):
+        """Initialize."""
+        self.config_dir = tempfile.mkdtemp(prefix="cyd_bench_")
+
+    def path(self, *parts):
+        """Return a path below the config directory."""
+        return os.path.join(self.config_dir, *parts)
+
+
+class FakeHass:
+    """The hass object handed to the integration."""
+
+    def __init__(self):
+        """Initialize, must be called with a running event loop."""
+        self.loop = asyncio.get_running_loop()
+        self.data = {}
+        self.states = FakeStateMachine()
+        self.services = FakeServiceRegistry()
+        self.bus = FakeBus()
+        self.config = FakeConfig()
+        self.config_entries = FakeConfigEntries()
+        self.http = FakeHTTP()
+        self.entity_registry = FakeEntityRegistry()
+        # er.async_get is a singleton on hass.data
+        self.data[er.DATA_REGISTRY] = self.entity_registry
+        self.state = CoreState.running
+        self.is_stopping = False
+        self._background_tasks = set()
+
+    def async_create_task(self, target, name=None, eager_start=True):
+        """Schedule a coroutine."""
+        return self.loop.create_task(target, name=name)
+
+    def async_create_background_task(self, target, name=None, eager_start=True):
+        """Schedule a background coroutine."""
+        task = self.loop.create_task(target, name=name)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+
+    async def async_block_till_done(self):
+        """Wait for the background tasks, including those they start."""
+        while self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+    def async_run_hass_job(self, hassjob, *args, background=False):
+        """Run a job, scheduling it if it returns a coroutine."""
+        result = hassjob.target(*args)
+        if asyncio.iscoroutine(result):
+            return self.async_create_task(result)
+        return None
+
+    def async_add_executor_job(self, target, *args):
+        """Run a function in the default executor."""
+        return self.loop.run_in_executor(None, target, *args)
+
+    def verify_event_loop_thread(self, what):
+        """Everything runs on the loop here."""
@@ -0,0 +1,274 @@
+"""Replay a recorded trace into the coordinator at 1x to 1000x speed.
+
+Record a trace in Home Assistant with the cyd_solar_display.record_trace
+service, copy it from config/cyd_solar_display/traces/ and run from the
+repository root (requires Home Assistant to be installed):
+
+    python benchmarks/replay_trace.py trace.ndjson.gz --speed 100
+    python benchmarks/replay_trace.py trace.ndjson.gz --speed 100 --set debounce_time=0.5 --set delta_encoding=false
+
+The event loop runs on a scaled clock, so debounce, heartbeat, page rotation,
+keyframe ages and push timeouts all shrink by the speed factor while the
+ticks themselves run at their real cost. The ESPHome services are stand-ins answering after
+--latency milliseconds (trace time). The report puts the pushes of the replay
+next to the recorded ones.
+"""
+import argparse
+import asyncio
+import collections
+import json
+import os
+import selectors
+import statistics
+import sys
+import time
+from types import MappingProxyType
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.fake_hass import FakeConfigEntry, FakeHass, FakeServiceRegistry  # noqa: E402
+from custom_components.cyd_solar_display.const import CONF_HOST, DOMAIN  # noqa: E402
+from custom_components.cyd_solar_display.coordinator import CYDSolarCoordinator  # noqa: E402
+from custom_components.cyd_solar_display.delta import DELTA_SERVICE_SUFFIX  # noqa: E402
+from custom_components.cyd_solar_display.rotation import PageRotationScheduler  # noqa: E402
+from custom_components.cyd_solar_display.trace import (  # noqa: E402
+    KIND_CALL,
+    KIND_HEADER,
+    KIND_STATE,
+    iter_trace,
+)
+
+REPLAY_HOST = "replay.local"
+MAX_SPEED = 1000
+
+
+class ScaledSelector(selectors.DefaultSelector):
+    """Selector that waits 1/speed of the (trace time) timeout it is given."""
+
+    def __init__(self, speed):
+        """Initialize."""
+        super().__init__()
+        self.speed = speed
+
+    def select(self, timeout=None):
+        """Wait for I/O on the real clock."""
+        return super().select(None if timeout is None else timeout / self.speed)
+
+
+class ScaledEventLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock runs speed times faster than the wall clock."""
+
+    def __init__(self, speed):
+        """Initialize."""
+        super().__init__(ScaledSelector(speed))
+        self.speed = speed
+
+    def time(self):
+        """Return the trace time."""
+        return time.monotonic() * self.speed
+
+
+class StandInESPHome(FakeServiceRegistry):
+    """ESPHome service registry that logs every push."""
+
+    def __init__(self, loop):
+        """Initialize."""
+        super().__init__()
+        self.loop = loop
+        self.log = []
+
+    async def async_call(self, domain, service, service_data=None, blocking=False, **kwargs):
+        """Log the push, then answer after the configured latency."""
+        if domain == "esphome":
+            self.log.append((self.loop.time(), service, service_data or {}))
+        await super().async_call(domain, service, service_data, blocking, **kwargs)
+
+
+class FakeEvent:
+    """Minimal stand-in for homeassistant.core.Event."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+
+def parse_overrides(pairs):
+    """Parse key=value option overrides, values as JSON where possible."""
+    overrides = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        try:
+            overrides[key] = json.loads(value)
+        except ValueError:
+            overrides[key] = value
+    return overrides
+
+
+def load_trace(path):
+    """Return the header and the records of a trace."""
+    records = iter_trace(path)
+    header = next(records, None)
+    if header is None or header.get("kind") != KIND_HEADER:
+        sys.exit(f"{path} is not a trace (no header)")
+    return header, list(records)
+
+
+def setup_stand_in(hass, header):
+    """Register the recorded display services and matching ESPHome entries."""
+    delta_capable = set(header.get("delta_capable", ()))
+    for idx, service in enumerate(header.get("targets", ())):
+        name = service[: -len("_update_display")] if service.endswith("_update_display") else service
+        hass.config_entries.async_add(
+            FakeConfigEntry(
+                entry_id=f"esphome_{idx}",
+                domain="esphome",
+                title=name,
+                # The first target is the display the trace was recorded for
+                data=MappingProxyType({"host": REPLAY_HOST if idx == 0 else f"replay-{idx}.local", "name": name}),
+            )
+        )
+        hass.services.async_register("esphome", service)
+        if service in delta_capable:
+            hass.services.async_register("esphome", f"{service}{DELTA_SERVICE_SUFFIX}")
+
+
+def summarize_calls(calls):
+    """Return push counts, payload bytes and the busiest second of (t, service, data) calls."""
+    per_second = collections.Counter(int(t) for t, _service, _data in calls)
+    delta = sum(1 for _t, service, _data in calls if service.endswith(DELTA_SERVICE_SUFFIX))
+    return {
+        "full": len(calls) - delta,
+        "delta": delta,
+        "bytes": sum(len(json.dumps(data, separators=(",", ":"))) for _t, _service, data in calls),
+        "peak_per_s": max(per_second.values(), default=0),
+    }
+
+
+async def async_replay(header, records, latency, overrides):
+    """Feed the records into a coordinator and return the replay summary."""
+    loop = asyncio.get_running_loop()
+    hass = FakeHass()
+    hass.services = StandInESPHome(loop)
+    hass.services.latency = latency
+    setup_stand_in(hass, header)
+
+    entry = FakeConfigEntry(
+        entry_id="replay",
+        domain=DOMAIN,
+        title="CYD Solar Replay",
+        data=MappingProxyType({CONF_HOST: REPLAY_HOST}),
+        options=MappingProxyType({**header.get("options", {}), **overrides}),
+    )
+    hass.config_entries.async_add(entry)
+
+    # Initial states (t == 0) before the first refresh, like a running instance
+    first = 0
+    while first < len(records) and records[first]["kind"] == KIND_STATE and records[first]["t"] == 0:
+        apply_state(hass, records[first])
+        first += 1
+
+    coordinator = CYDSolarCoordinator(hass, entry)
+    ticks = []
+    coordinator.async_add_listener(lambda: ticks.append(coordinator.last_tick_duration))
+    await coordinator.async_refresh()
+
+    # What async_start_tracking would subscribe to, without the network and registries
+    unsubs = []
+    if coordinator.ha_rotation_active:
+        rotation = PageRotationScheduler(hass, coordinator.slot_plan.page_interval, coordinator._async_handle_rotation_tick)
+        rotation.async_start()
+        unsubs.append(rotation.async_stop)
+    tracked = set(coordinator.tracked_entity_ids)
+
+    def feed(record):
+        old_state = hass.states.get(record["entity_id"])
+        new_state = apply_state(hass, record)
+        if coordinator.event_driven and record["entity_id"] in tracked:
+            coordinator._async_handle_state_change(
+                FakeEvent({"entity_id": record["entity_id"], "old_state": old_state, "new_state": new_state})
+            )
+
+    started = loop.time()
+    wall_started = time.perf_counter()
+    states = 0
+    for record in records[first:]:
+        if record["kind"] == KIND_STATE:
+            loop.call_at(started + record["t"], feed, record)
+            states += 1
+    duration = max((record["t"] for record in records), default=0.0)
+    # Let the last debounce and push run out
+    await asyncio.sleep(duration + coordinator._debounced_refresh.cooldown + 1)
+    wall = time.perf_counter() - wall_started
+
+    while unsubs:
+        unsubs.pop()()
+    await coordinator.async_shutdown()
+
+    ticks = [tick for tick in ticks if tick is not None]
+    ticks.sort()
+    return {
+        "duration": duration,
+        "wall": wall,
+        "states": states,
+        "ticks": len(ticks),
+        "tick_p50_ms": statistics.median(ticks) * 1000 if ticks else None,
+        "tick_p95_ms": ticks[min(len(ticks) - 1, int(len(ticks) * 0.95))] * 1000 if ticks else None,
+        "tick_max_ms": ticks[-1] * 1000 if ticks else None,
+        "calls": summarize_calls([(t - started, service, data) for t, service, data in hass.services.log]),
+        "counters": dict(coordinator.metrics.counters),
+    }
+
+
+def apply_state(hass, record):
+    """Write a recorded state into the fake state machine, returns the new state."""
+    if record["state"] is None:
+        hass.states.async_remove(record["entity_id"])
+        return None
+    attributes = {"unit_of_measurement": record["unit"]} if record.get("unit") else {}
+    hass.states.async_set(record["entity_id"], record["state"], attributes)
+    return hass.states.get(record["entity_id"])
+
+
+def print_report(header, records, result, speed):
+    """Print the replay next to the recording."""
+    recorded = summarize_calls([(r["t"], r["service"], r["data"]) for r in records if r["kind"] == KIND_CALL])
+    replayed = result["calls"]
+    print(f"Trace from {header.get('started')}: {result['duration']:.0f} s, {result['states']} state changes")
+    print(f"Replayed at {speed}x in {result['wall']:.2f} s wall time, {result['ticks']} ticks")
+    if result["ticks"]:
+        print(
+            f"  tick p50 {result['tick_p50_ms']:.2f} ms, p95 {result['tick_p95_ms']:.2f} ms, "
+            f"max {result['tick_max_ms']:.2f} ms"
+        )
+    print(f"  counters {result['counters']}")
+    print(f"  {'':<12}{'recorded':>12}{'replayed':>12}")
+    for key in ("full", "delta", "bytes", "peak_per_s"):
+        print(f"  {key:<12}{recorded[key]:>12}{replayed[key]:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="trace file (.ndjson.gz)")
+    parser.add_argument("--speed", type=float, default=1.0, help=f"replay speed, 1 to {MAX_SPEED}")
+    parser.add_argument("--latency", type=float, default=20.0, help="stand-in ESPHome latency in ms (trace time)")
+    parser.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE",
+                        help="override an option of the recording, e.g. debounce_time=0.5")
+    args = parser.parse_args()
+
+    if not 1 <= args.speed <= MAX_SPEED:
+        parser.error(f"--speed must be between 1 and {MAX_SPEED}")
+
+    header, records = load_trace(args.trace)
+    loop = ScaledEventLoop(args.speed)
+    try:
+        result = loop.run_until_complete(
+            async_replay(header, records, args.latency / 1000, parse_overrides(args.overrides))
+        )
+    finally:
+        loop.close()
+    print_report(header, records, result, args.speed)
+
+
+if __name__ == "__main__":
+    main()
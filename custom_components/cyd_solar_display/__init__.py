@@ -1,66 +1,98 @@
 import logging
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.components import frontend, panel_custom
 from homeassistant.components.http import StaticPathConfig, HomeAssistantView
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 from aiohttp import web
+import voluptuous as vol
+from voluptuous.humanize import humanize_error
 
-from .const import DOMAIN
-from .coordinator import CYDSolarCoordinator
+from .const import DOMAIN, INTERNAL_OPTIONS, STRUCTURAL_OPTIONS
+from .coordinator import CYDSolarCoordinator, frame_store, page_store
+from .options import (
+    PATCH_SCHEMA,
+    async_flush_options_writers,
+    async_get_options_writer,
+    compute_etag,
+    public_options,
+)
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
+PLATFORMS = ["update", "sensor", "binary_sensor"]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Register static files with a FIXED path (no entry_id!)
+# entry_id would change across restarts, breaking the panel URL
+STATIC_URL = "/cyd_solar_display/static"
+# Stable JS URL (no entry_id dependency)
+JS_URL = f"{STATIC_URL}/cyd-preview.js"
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the API views, static files, panel and services once per Home Assistant run."""
+    hass.data.setdefault(DOMAIN, {})
+
+    hass.http.register_view(CYDConfigView(hass))
+    hass.http.register_view(CYDCheckUpdateView(hass))
+    async_setup_services(hass)
+
+    async def _async_flush_options(_event: Event) -> None:
+        """Write panel saves still waiting for their delay before HA stops."""
+        await async_flush_options_writers(hass)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_flush_options)
+
+    await hass.http.async_register_static_paths([
+        StaticPathConfig(
+            STATIC_URL,
+            hass.config.path(f"custom_components/{DOMAIN}/www"),
+            False   # cache=False so updates are visible immediately
+        )
+    ])
+
+    # The panel edits the first entry; async_setup runs once the entries are loaded
+    entries = hass.config_entries.async_entries(DOMAIN)
+    try:
+        await panel_custom.async_register_panel(
+            hass,
+            frontend_url_path=DOMAIN,
+            webcomponent_name="cyd-preview",
+            module_url=JS_URL,
+            sidebar_title="CYD Monitor",
+            sidebar_icon="mdi:monitor-dashboard",
+            require_admin=True,
+            config={"entry_id": entries[0].entry_id} if entries else {}
+        )
+    except Exception as err:
+        _LOGGER.warning("Panel already registered or error: %s", err)
+
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up CYD Solar Display from a config entry."""
+    """Set up CYD Solar Display from a config entry (no network I/O on this path)."""
     
     coordinator = CYDSolarCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    # Local storage only, the last frames shown until the sources report
+    await coordinator.async_restore_state()
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
     hass.data.setdefault(f"{DOMAIN}_old_options_{entry.entry_id}", dict(entry.options))
+    hass.data.setdefault(f"{DOMAIN}_old_data_{entry.entry_id}", dict(entry.data))
 
-    # Register API View for Panel Config (only once)
-    if "api_registered" not in hass.data[DOMAIN]:
-        hass.http.register_view(CYDConfigView(hass))
-        hass.http.register_view(CYDCheckUpdateView(hass))
-        hass.data[DOMAIN]["api_registered"] = True
-
-    # Register static files with a FIXED path (no entry_id!)
-    # entry_id would change across restarts, breaking the panel URL
-    static_url = "/cyd_solar_display/static"
-    if "static_registered" not in hass.data[DOMAIN]:
-        await hass.http.async_register_static_paths([
-            StaticPathConfig(
-                static_url,
-                hass.config.path(f"custom_components/{DOMAIN}/www"),
-                False   # cache=False so updates are visible immediately
-            )
-        ])
-        hass.data[DOMAIN]["static_registered"] = True
-
-    # Stable JS URL (no entry_id dependency)
-    js_url = f"{static_url}/cyd-preview.js"
+    coordinator.async_start_tracking()
     
-    # NEW: Forward setups to platforms (update)
-    await hass.config_entries.async_forward_entry_setups(entry, ["update"])
+    # Forward setups to platforms (update, diagnostic sensors, connectivity)
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # Register the Sidebar Panel (only once, guard by checking frontend_panels)
-    frontend_panels = hass.data.get("frontend_panels", {})
-    if DOMAIN not in frontend_panels:
-        try:
-            await panel_custom.async_register_panel(
-                hass,
-                frontend_url_path=DOMAIN,
-                webcomponent_name="cyd-preview",
-                module_url=js_url,
-                sidebar_title="CYD Monitor",
-                sidebar_icon="mdi:monitor-dashboard",
-                require_admin=True,
-                config={"entry_id": entry.entry_id}
-            )
-        except Exception as err:
-            _LOGGER.warning("Panel already registered or error: %s", err)
+    # The first push runs in the background, a slow display or GitHub never holds up startup
+    entry.async_create_background_task(hass, coordinator.async_refresh(), f"{DOMAIN} first refresh")
 
     entry.async_on_unload(entry.add_update_listener(update_listener))
 
@@ -68,7 +100,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, ["update"])
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
         # Wir entfernen das Panel hier NICHT, da ein Reload (z.B. durch Speichern in der UI) 
@@ -79,71 +111,128 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             coordinator = hass.data[DOMAIN].pop(entry.entry_id)
             if hasattr(coordinator, "_unsub_dummy") and coordinator._unsub_dummy:
                 coordinator._unsub_dummy()
+            coordinator.async_stop_tracking()
+            await coordinator.async_shutdown()
+            await coordinator.async_save_state()
+
+        # Pending panel saves are written now and picked up by the next setup
+        await async_flush_options_writers(hass, entry.entry_id)
 
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored rotation state and frames of a deleted entry."""
+    await page_store(hass, entry.entry_id).async_remove()
+    await frame_store(hass, entry.entry_id).async_remove()
+
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update."""
-    # If the update only contains the last_page sync info, don't reload
-    # We use a simple comparison of other options if needed, but for now 
-    # we just accept that page-syncs might trigger a reload OR we could 
-    # use a flag.
-    
-    # Check if anything OTHER than last_page or _last_sync changed
+    """Handle options update: reload for structural changes, apply everything else in place."""
     old_options = hass.data.get(f"{DOMAIN}_old_options_{entry.entry_id}", {})
+    old_data = hass.data.get(f"{DOMAIN}_old_data_{entry.entry_id}", {})
     new_options = dict(entry.options)
-    
-    significant_change = False
-    for k, v in new_options.items():
-        if k in ["last_page", "_last_sync"]:
-            continue
-        if old_options.get(k) != v:
-            significant_change = True
-            break
-            
     hass.data[f"{DOMAIN}_old_options_{entry.entry_id}"] = new_options
-    
-    if significant_change:
-        _LOGGER.debug("Significant config change detected, reloading...")
+    hass.data[f"{DOMAIN}_old_data_{entry.entry_id}"] = dict(entry.data)
+
+    # Page syncs (last_page, _last_sync) are written by the integration itself
+    changed = {
+        k for k in old_options.keys() | new_options.keys()
+        if k not in INTERNAL_OPTIONS and old_options.get(k) != new_options.get(k)
+    }
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+
+    if coordinator is None:
+        _LOGGER.debug("Entry not loaded, options apply on the next setup.")
+    elif dict(entry.data) != old_data or changed & set(STRUCTURAL_OPTIONS):
+        _LOGGER.debug("Structural config change detected, reloading...")
         await hass.config_entries.async_reload(entry.entry_id)
+    elif changed:
+        coordinator.async_apply_options(changed)
     else:
         _LOGGER.debug("Internal page sync update, skipping reload.")
 
 class CYDConfigView(HomeAssistantView):
-    """API Endpoint context for panel configuration."""
+    """API Endpoint context for panel configuration.
+
+    The ETag versions the options only; the firmware fields next to them
+    change with every version check and must not fail an If-Match. GET
+    answers 304 if the panel already has that version of the options.
+    POST takes a JSON merge patch of the changed options, validated against
+    the known option keys; with If-Match a stale panel gets 412 instead of
+    overwriting newer settings. Saves are written after a short delay so a
+    burst of saves ends up as a single options update.
+    """
     url = "/api/cyd_solar_display/config/{entry_id}"
     name = "api:cyd_solar_display:config"
     requires_auth = True
 
     def __init__(self, hass: HomeAssistant):
+        """Initialize."""
         self.hass = hass
 
+    def _body(self, entry: ConfigEntry) -> dict:
+        """Return the panel view of an entry, pending saves included."""
+        coordinator = self.hass.data[DOMAIN].get(entry.entry_id)
+        data = (coordinator.data or {}) if coordinator else {}
+        return {
+            "config": public_options(async_get_options_writer(self.hass, entry).options),
+            "latest_version": coordinator.latest_version if coordinator else "0.0.0",
+            "firmware_update_entity_id": data.get("firmware_update_entity_id", ""),
+        }
+
+    def _respond(self, body: dict, etag: str) -> web.Response:
+        """Return the body with its ETag."""
+        response = self.json(body)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
     async def get(self, request: web.Request, entry_id: str) -> web.Response:
         """Get current options."""
         entry = self.hass.config_entries.async_get_entry(entry_id)
         if not entry:
             return self.json_message("Entry not found", 404)
-        
-        coordinator = self.hass.data[DOMAIN].get(entry_id)
-        
-        return self.json({
-            "config": dict(entry.options),
-            "latest_version": coordinator.latest_version if coordinator else "0.0.0",
-            "firmware_update_entity_id": coordinator.data.get("firmware_update_entity_id", "") if coordinator else ""
-        })
+
+        body = self._body(entry)
+        etag = compute_etag(body["config"])
+        if etag in _etags(request.headers.get("If-None-Match")):
+            return web.Response(status=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+        return self._respond(body, etag)
 
     async def post(self, request: web.Request, entry_id: str) -> web.Response:
-        """Update options."""
-        data = await request.json()
+        """Apply a merge patch of the changed options."""
         entry = self.hass.config_entries.async_get_entry(entry_id)
         if not entry:
             return self.json_message("Entry not found", 404)
-        
-        new_options = dict(entry.options)
-        new_options.update(data)
-        
-        self.hass.config_entries.async_update_entry(entry, options=new_options)
-        return self.json({"status": "ok"})
+
+        try:
+            patch = await request.json()
+        except ValueError:
+            return self.json_message("Ungültiges JSON", 400)
+        if not isinstance(patch, dict):
+            return self.json_message("Erwartet ein JSON-Objekt mit den geänderten Optionen", 400)
+
+        etag = compute_etag(public_options(async_get_options_writer(self.hass, entry).options))
+        if_match = request.headers.get("If-Match")
+        if if_match is not None and "*" not in _etags(if_match) and etag not in _etags(if_match):
+            response = self.json_message("Die Einstellungen wurden zwischenzeitlich geändert", 412)
+            response.headers["ETag"] = etag
+            return response
+
+        try:
+            patch = PATCH_SCHEMA(patch)
+        except vol.Invalid as err:
+            return self.json_message(f"Ungültige Einstellungen: {humanize_error(patch, err)}", 400)
+
+        async_get_options_writer(self.hass, entry).async_patch(patch)
+        body = self._body(entry)
+        return self._respond(body, compute_etag(body["config"]))
+
+
+def _etags(header: str | None) -> set[str]:
+    """Return the entity tags of an If-Match / If-None-Match header."""
+    if not header:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
 
 
 class CYDCheckUpdateView(HomeAssistantView):
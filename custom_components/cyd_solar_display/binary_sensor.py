@@ -0,0 +1,67 @@
+import logging
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_SUFFIX = "_update_display"
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """Set up one connectivity sensor per display service, added as the services are resolved."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    known = set()
+
+    @callback
+    def _async_add_new_targets():
+        """Add sensors for display services seen for the first time (e.g. broadcast mode)."""
+        new = [srv for srv in coordinator.target_resolver.targets if srv not in known]
+        if new:
+            known.update(new)
+            async_add_entities(CYDDisplayConnectivitySensor(coordinator, entry, srv) for srv in new)
+
+    _async_add_new_targets()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_new_targets))
+
+
+class CYDDisplayConnectivitySensor(CoordinatorEntity, BinarySensorEntity):
+    """On while one display service takes pushes, off once its circuit breaker opened."""
+
+    _attr_has_entity_name = True
+    _attr_translation_key = "display_connected"
+    _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator, entry, target):
+        """Initialize."""
+        super().__init__(coordinator)
+        self.target = target
+        self._attr_unique_id = f"{entry.entry_id}_{target}_connected"
+        self._attr_translation_placeholders = {"display": target.removesuffix(SERVICE_SUFFIX)}
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, entry.entry_id)})
+
+    @property
+    def available(self):
+        """Return True while the service is still a target of the entry."""
+        return super().available and self.target in self.coordinator.target_resolver.targets
+
+    @property
+    def is_on(self):
+        """Return True if the display takes pushes, None before the first push."""
+        return self.coordinator.target_available(self.target)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the breaker state of the display."""
+        channel = self.coordinator.channels.get(self.target)
+        return {"service": self.target, **(channel.breaker.as_dict() if channel else {})}
@@ -0,0 +1,80 @@
+"""Activity-driven refresh cadence for the CYD Solar Display integration."""
+
+# Power values (W) whose swings make the cadence faster
+POWER_KEYS = ("solar", "grid", "house", "bat_w")
+
+# A power value moving by more than this share of its value (and at least
+# FAST_CHANGE_MIN_W) counts as a fast change, e.g. a passing cloud
+FAST_CHANGE_RATIO = 0.05
+FAST_CHANGE_MIN_W = 25.0
+
+# Power values staying within this band (share of the value, at least
+# IDLE_DEADBAND_MIN_W) count as idle, so sensor jitter still stretches
+IDLE_DEADBAND_RATIO = 0.02
+IDLE_DEADBAND_MIN_W = 20.0
+
+SHRINK = 0.5
+STRETCH = 1.5
+
+
+class AdaptiveCadence:
+    """Poll interval that follows how much the values move.
+
+    Activity is judged on the power values only. Fast swings halve the
+    interval down to the minimum; power values staying within the idle
+    deadband of where they last settled stretch it by half up to the maximum
+    (nights, idle battery), whatever the other fields do; ordinary changes
+    move it back toward the configured update interval.
+    """
+
+    def __init__(self, base, minimum, maximum):
+        """Initialize."""
+        self.minimum = max(1.0, float(minimum))
+        self.maximum = max(self.minimum, float(maximum))
+        self.base = self._clamp(float(base))
+        self.interval = self.base
+        self._last = None
+        self._settled = {}
+
+    def _clamp(self, interval):
+        """Keep an interval within the configured bounds."""
+        return min(self.maximum, max(self.minimum, interval))
+
+    def update(self, frame):
+        """Feed the frame of a tick, returns the seconds until the next tick."""
+        last, self._last = self._last, frame
+        if last is None:
+            self._settled = {key: frame.get(key) for key in POWER_KEYS}
+            return self.interval
+
+        # Compared with the settled value, not the last frame, so a slow drift adds up
+        moved = [key for key in POWER_KEYS if _outside_deadband(self._settled.get(key), frame.get(key))]
+        for key in moved:
+            self._settled[key] = frame.get(key)
+
+        if any(_fast_change(last.get(key), frame.get(key)) for key in POWER_KEYS):
+            interval = self.interval * SHRINK
+        elif moved:
+            if self.interval > self.base:
+                interval = max(self.base, self.interval * SHRINK)
+            else:
+                interval = min(self.base, self.interval * STRETCH)
+        else:
+            interval = self.interval * STRETCH
+
+        self.interval = round(self._clamp(interval), 1)
+        return self.interval
+
+
+def _outside_deadband(old, new):
+    """Return True if a power value left the idle deadband around its settled value."""
+    if not isinstance(old, (int, float)) or not isinstance(new, (int, float)):
+        return old != new
+    return abs(new - old) > max(IDLE_DEADBAND_MIN_W, abs(old) * IDLE_DEADBAND_RATIO)
+
+
+def _fast_change(old, new):
+    """Return True if a power value moved enough to count as a fast change."""
+    if not isinstance(old, (int, float)) or not isinstance(new, (int, float)):
+        return False
+    return abs(new - old) >= max(FAST_CHANGE_MIN_W, abs(old) * FAST_CHANGE_RATIO)
@@ -91,6 +91,23 @@ from .const import (
     CONF_PAGE_SWITCH_MODE,
     CONF_PAGE_ROTATION_SOURCE,
     CONF_BROADCAST_MODE,
+    CONF_PUSH_MODE,
+    CONF_DEBOUNCE_TIME,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_DELTA_ENCODING,
+    CONF_KEYFRAME_INTERVAL,
+    CONF_PAGE_SCOPED,
+    CONF_ADAPTIVE_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
+    DEFAULT_KEYFRAME_INTERVAL,
+    DEFAULT_DEBOUNCE_TIME,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+    PUSH_MODE_EVENT,
+    DEFAULT_PUSH_MODE,
+    PUSH_MODE_POLL,
     PAGE_SWITCH_AUTO,
     PAGE_SWITCH_TOUCH,
     PAGE_SWITCH_BOTH,
@@ -157,7 +174,6 @@ class CYDSolarOptionsFlow(config_entries.OptionsFlow):
         def get_opt(key):
             val = opt.get(key, data_dict.get(key))
             if val is None:
-                import voluptuous as vol
                 return vol.UNDEFINED
             return val
 
@@ -273,7 +289,25 @@ class CYDSolarOptionsFlow(config_entries.OptionsFlow):
                 vol.Optional(CONF_SHOW_KW, default=opt.get(CONF_SHOW_KW, False)): bool,
                 vol.Optional(CONF_BROADCAST_MODE, default=opt.get(CONF_BROADCAST_MODE, False)): bool,
                 vol.Optional("update_interval", default=opt.get("update_interval", 5)): int,
-                vol.Optional(CONF_PAGE_INTERVAL, default=opt.get(CONF_PAGE_INTERVAL, 10)): int,
+                vol.Optional(CONF_ADAPTIVE_INTERVAL, default=opt.get(CONF_ADAPTIVE_INTERVAL, False)): bool,
+                vol.Optional(CONF_MIN_INTERVAL, default=opt.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(CONF_MAX_INTERVAL, default=opt.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(CONF_PAGE_INTERVAL, default=opt.get(CONF_PAGE_INTERVAL, 10)): vol.All(int, vol.Range(min=1)),
+                vol.Optional(CONF_PUSH_MODE, default=opt.get(CONF_PUSH_MODE, DEFAULT_PUSH_MODE)):
+                    selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                {"value": PUSH_MODE_EVENT, "label": "⚡ Ereignisgesteuert (bei Änderung senden)"},
+                                {"value": PUSH_MODE_POLL,  "label": "⏱️ Festes Intervall (Polling)"},
+                            ],
+                            mode=selector.SelectSelectorMode.LIST,
+                        )
+                    ),
+                vol.Optional(CONF_DEBOUNCE_TIME, default=opt.get(CONF_DEBOUNCE_TIME, DEFAULT_DEBOUNCE_TIME)): vol.Coerce(float),
+                vol.Optional(CONF_HEARTBEAT_INTERVAL, default=opt.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL)): int,
+                vol.Optional(CONF_DELTA_ENCODING, default=opt.get(CONF_DELTA_ENCODING, True)): bool,
+                vol.Optional(CONF_KEYFRAME_INTERVAL, default=opt.get(CONF_KEYFRAME_INTERVAL, DEFAULT_KEYFRAME_INTERVAL)): int,
+                vol.Optional(CONF_PAGE_SCOPED, default=opt.get(CONF_PAGE_SCOPED, True)): bool,
                 vol.Optional(CONF_PAGE_SWITCH_MODE, default=opt.get(CONF_PAGE_SWITCH_MODE, PAGE_SWITCH_AUTO)):
                     selector.SelectSelector(
                         selector.SelectSelectorConfig(
@@ -110,12 +110,65 @@ CONF_PAGE_SWITCH_MODE = "page_switch_mode"   # "auto" | "touch" | "both"
 CONF_PAGE_ROTATION_SOURCE = "page_rotation_source" # "ha" | "display"
 CONF_THEME_COLOR = "theme_color"
 CONF_BROADCAST_MODE = "broadcast_mode"
+CONF_DIM_START_TIME = "dim_start_time"
+CONF_DIM_END_TIME = "dim_end_time"
+CONF_DIM_BRIGHTNESS = "dim_brightness"
+
+# Push Engine
+CONF_PUSH_MODE = "push_mode"                  # "event" | "poll"
+CONF_DEBOUNCE_TIME = "debounce_time"
+CONF_HEARTBEAT_INTERVAL = "heartbeat_interval"
+CONF_DELTA_ENCODING = "delta_encoding"
+CONF_KEYFRAME_INTERVAL = "keyframe_interval"
+CONF_PAGE_SCOPED = "page_scoped"
+CONF_ADAPTIVE_INTERVAL = "adaptive_interval"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+
+# Options that need a config entry reload; all others are applied in place.
+# Host and port live in the entry data, a data change always reloads.
+STRUCTURAL_OPTIONS = (CONF_HOST, CONF_PORT, CONF_PUSH_MODE)
+# Written by the integration itself, never a user change
+INTERNAL_OPTIONS = ("last_page", "_last_sync")
+
+PUSH_MODE_EVENT = "event"
+PUSH_MODE_POLL  = "poll"
 
 PAGE_SWITCH_AUTO  = "auto"
 PAGE_SWITCH_TOUCH = "touch"
 PAGE_SWITCH_BOTH  = "both"
 
+# Panel config API: saves within this window go out as one options update
+OPTIONS_WRITE_DELAY = 1.0
+
+# Services
+SERVICE_UPDATE_FLEET = "update_fleet"
+SERVICE_PROFILE = "profile"
+SERVICE_RECORD_TRACE = "record_trace"
+
+# Firmware
+VERSION_URL = "https://raw.githubusercontent.com/low-streaming/cyd_solar_display/main/version.txt"
+FIRMWARE_URL = "https://raw.githubusercontent.com/low-streaming/cyd_solar_display/main/cyd_solar_display.bin"
+FIRMWARE_CHECKSUM_URL = f"{FIRMWARE_URL}.sha256"
+FIRMWARE_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# Profiling: older dumps beyond this count are deleted
+PROFILE_MAX_FILES = 10
+
 DEFAULT_PORT = 80
 DEFAULT_UPDATE_INTERVAL = 5
+DEFAULT_MIN_INTERVAL = 2
+DEFAULT_MAX_INTERVAL = 60
 DEFAULT_PAGE_INTERVAL = 10
+# Existing installs keep the fixed interval; event mode is opt-in
+DEFAULT_PUSH_MODE = PUSH_MODE_POLL
+DEFAULT_DEBOUNCE_TIME = 1.0
+DEFAULT_HEARTBEAT_INTERVAL = 60
+DEFAULT_KEYFRAME_INTERVAL = 300
+DEFAULT_PUSH_TIMEOUT = 5
+DEFAULT_VERSION_CHECK_INTERVAL = 3600
+DEFAULT_FLEET_CONCURRENCY = 4
+DEFAULT_FLEET_CANARIES = 1
+DEFAULT_FLEET_TIMEOUT = 300
+DEFAULT_FLEET_MAX_FAILURE_RATE = 0.25
 DEFAULT_THEME_COLOR = "#fdd835"  # Home Assistant Solar Yellow
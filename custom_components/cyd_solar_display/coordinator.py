@@ -1,126 +1,146 @@
 import logging
 import json
 import asyncio
-from datetime import timedelta, datetime
-import aiohttp
+import time
+from dataclasses import asdict, dataclass
+from datetime import timedelta
 
+from homeassistant.core import callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.helpers.storage import Store
+from homeassistant.const import (
+    ATTR_DOMAIN,
+    ATTR_SERVICE,
+    ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_SERVICE_REGISTERED,
+)
 
 from .const import (
     DOMAIN,
     CONF_HOST,
-    CONF_PORT,
-    CONF_SOLAR_ENTITY,
-    CONF_GRID_ENTITY,
-    CONF_HOUSE_ENTITY,
-    CONF_BATTERY_ENTITY,
-    CONF_BATTERY_SOC_ENTITY,
-    CONF_YIELD_TODAY_ENTITY,
-    CONF_YIELD_MONTH_ENTITY,
-    CONF_YIELD_YEAR_ENTITY,
-    CONF_YIELD_TOTAL_ENTITY,
-    CONF_GRID_IMPORT_ENTITY,
-    CONF_GRID_EXPORT_ENTITY,
-    CONF_CUSTOM1_NAME,
-    CONF_CUSTOM1_ENTITY,
-    CONF_CUSTOM2_NAME,
-    CONF_CUSTOM2_ENTITY,
-    CONF_ENABLE_PAGE3,
-    CONF_CUSTOM3_NAME,
-    CONF_CUSTOM3_ENTITY,
-    CONF_CUSTOM4_NAME,
-    CONF_CUSTOM4_ENTITY,
-    CONF_ENABLE_PAGE4,
-    CONF_CUSTOM5_NAME,
-    CONF_CUSTOM5_ENTITY,
-    CONF_CUSTOM6_NAME,
-    CONF_CUSTOM6_ENTITY,
-    CONF_CUSTOM7_NAME,
-    CONF_CUSTOM7_ENTITY,
-    CONF_CUSTOM8_NAME,
-    CONF_CUSTOM8_ENTITY,
-    CONF_ENABLE_PAGE1,
-    CONF_ENABLE_PAGE2,
-    CONF_ENABLE_PAGE5,
-    CONF_MINING1_NAME,
-    CONF_MINING1_ENTITY,
-    CONF_MINING2_NAME,
-    CONF_MINING2_ENTITY,
-    CONF_MINING3_NAME,
-    CONF_MINING3_ENTITY,
-    CONF_MINING4_NAME,
-    CONF_MINING4_ENTITY,
-    CONF_ENABLE_PAGE6,
-    CONF_CUSTOM9_NAME,
-    CONF_CUSTOM9_ENTITY,
-    CONF_CUSTOM10_NAME,
-    CONF_CUSTOM10_ENTITY,
-    CONF_CUSTOM11_NAME,
-    CONF_CUSTOM11_ENTITY,
-    CONF_CUSTOM12_NAME,
-    CONF_CUSTOM12_ENTITY,
-    CONF_ENABLE_PAGE7,
-    CONF_CUSTOM13_NAME,
-    CONF_CUSTOM13_ENTITY,
-    CONF_CUSTOM14_NAME,
-    CONF_CUSTOM14_ENTITY,
-    CONF_CUSTOM15_NAME,
-    CONF_CUSTOM15_ENTITY,
-    CONF_CUSTOM16_NAME,
-    CONF_CUSTOM16_ENTITY,
-    CONF_ENABLE_PAGE8,
-    CONF_CUSTOM17_NAME,
-    CONF_CUSTOM17_ENTITY,
-    CONF_CUSTOM18_NAME,
-    CONF_CUSTOM18_ENTITY,
-    CONF_CUSTOM19_NAME,
-    CONF_CUSTOM19_ENTITY,
-    CONF_CUSTOM20_NAME,
-    CONF_CUSTOM20_ENTITY,
-    CONF_ENABLE_PAGE9,
-    CONF_CUSTOM21_NAME,
-    CONF_CUSTOM21_ENTITY,
-    CONF_CUSTOM22_NAME,
-    CONF_CUSTOM22_ENTITY,
-    CONF_CUSTOM23_NAME,
-    CONF_CUSTOM23_ENTITY,
-    CONF_CUSTOM24_NAME,
-    CONF_CUSTOM24_ENTITY,
-    CONF_SHOW_KW,
-    CONF_AUTO_PAGE_SWITCH,
-    CONF_PAGE_INTERVAL,
-    CONF_PAGE_SWITCH_MODE,
-    CONF_PAGE_ROTATION_SOURCE,
-    CONF_BROADCAST_MODE,
-    PAGE_SWITCH_AUTO,
+    CONF_PUSH_MODE,
+    CONF_DEBOUNCE_TIME,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_DELTA_ENCODING,
+    CONF_KEYFRAME_INTERVAL,
+    CONF_ADAPTIVE_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
     PAGE_SWITCH_TOUCH,
-    PAGE_SWITCH_BOTH,
+    PUSH_MODE_EVENT,
+    DEFAULT_PUSH_MODE,
+    DEFAULT_DEBOUNCE_TIME,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_KEYFRAME_INTERVAL,
+    DEFAULT_PUSH_TIMEOUT,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_INTERVAL,
+)
+from .cadence import AdaptiveCadence
+from .delta import DeltaEncoder, DELTA_SERVICE_SUFFIX, delta_service_name
+from .health import DisplayChannel
+from .metrics import (
+    TickMetrics,
+    PHASE_TICK,
+    PHASE_DISCOVERY,
+    PHASE_GATHER,
+    PHASE_ROTATION,
+    PHASE_DISPATCH,
+    COUNTER_PUSHES,
+    COUNTER_SKIPPED,
+    COUNTER_FAILURES,
 )
+from .resolver import ESPHomeDeviceResolver, ServiceTargetResolver
+from .rotation import PageRotationScheduler
+from .slots import SlotPlan
+from .version import async_get_version_service
 
 _LOGGER = logging.getLogger(__name__)
 
+STORAGE_VERSION = 1
+# Page flips are frequent, the visible page is written at most every 5 minutes (and on shutdown)
+PAGE_SAVE_DELAY = 300
+# Same for the last frame per display, it only matters for the next start
+FRAME_SAVE_DELAY = 300
+
+
+def page_store(hass, entry_id):
+    """Return the store holding the rotation state of an entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.page")
+
+
+def frame_store(hass, entry_id):
+    """Return the store holding the last pushed frame per display of an entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.frames")
+
+
+@dataclass
+class PushStats:
+    """Push accounting of one display service."""
+
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    last_error: str | None = None
+    last_duration: float | None = None
+
+
 class CYDSolarCoordinator(DataUpdateCoordinator):
     """Coordinator to manage solar data and push to CYD."""
 
     def __init__(self, hass, entry):
         """Initialize."""
         self.entry = entry
-        self.last_page_switch = datetime.now()
-        self.latest_version = "0.0.0"
-        self.last_version_check = None
-        self.version_url = "https://raw.githubusercontent.com/low-streaming/cyd_solar_display/main/version.txt"
+        self.version_service = async_get_version_service(hass)
         
-        # Restore last page from options
+        # Restored from the page store in async_restore_state (options only for older installs)
         self.current_page = entry.options.get("last_page", 1)
-        
-        update_interval = entry.options.get("update_interval", 5)
+        self._page_store = page_store(hass, entry.entry_id)
+        self._page_save_pending = False
+
+        # Warm start: the last pushed frames are shown until the source entities report
+        self._frame_store = frame_store(hass, entry.entry_id)
+        self._frame_save_pending = False
+        self.last_frames = {}
+        self.live = False
+
+        # Event mode: push on state changes (debounced), the interval is only a heartbeat.
+        # Poll mode: the classic update_interval, optionally adaptive within min/max (see cadence.py).
+        self.event_driven = entry.options.get(CONF_PUSH_MODE, DEFAULT_PUSH_MODE) == PUSH_MODE_EVENT
+        self._unsub_tracking = []
+        # Per entity and the rotation clock, so options can be applied in place (async_apply_options)
+        self._unsub_states = {}
+        self._rotation = None
+        self._slot_plan = None
+
+        # Fan-out metrics, see _async_push_all
+        self.push_timeout = DEFAULT_PUSH_TIMEOUT
+        self.push_stats = {}
+        # One single-flight channel with a circuit breaker per display service (see health.py)
+        self.channels = {}
+        self.last_tick_duration = None
+        self.metrics = TickMetrics()
+
+        # ESPHome device/entity lookup, cached until the registries change
+        self.device_resolver = ESPHomeDeviceResolver(hass, entry.data.get(CONF_HOST))
+        self.target_resolver = ServiceTargetResolver(hass, entry)
+
+        # Delta encoding: only changed fields go to the display, with periodic keyframes
+        self.delta_encoding = bool(entry.options.get(CONF_DELTA_ENCODING, True))
+        self._delta = DeltaEncoder(
+            int(entry.options.get(CONF_KEYFRAME_INTERVAL, DEFAULT_KEYFRAME_INTERVAL)), hass.loop.time
+        )
+
+        update_interval, debounce, self.cadence = self._timing(entry.options)
+
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=int(entry.options.get("update_interval", 5))),
+            update_interval=timedelta(seconds=update_interval),
+            request_refresh_debouncer=Debouncer(hass, _LOGGER, cooldown=debounce, immediate=False),
         )
         
         # VERY IMPORTANT: DataUpdateCoordinator stops polling natively if there are no listeners.
@@ -128,60 +148,255 @@ class CYDSolarCoordinator(DataUpdateCoordinator):
         # a dummy listener so it runs forever in the background.
         self._unsub_dummy = self.async_add_listener(self._dummy_listener)
 
+    def _timing(self, options):
+        """Return the update interval, debounce window and adaptive cadence (or None) of options."""
+        if self.event_driven:
+            update_interval = int(options.get(CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL))
+            debounce = float(options.get(CONF_DEBOUNCE_TIME, DEFAULT_DEBOUNCE_TIME))
+            return update_interval, debounce, None
+
+        update_interval = int(options.get("update_interval", 5))
+        if not options.get(CONF_ADAPTIVE_INTERVAL, False):
+            return update_interval, 0.0, None
+        cadence = AdaptiveCadence(
+            update_interval,
+            options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+            options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+        )
+        return cadence.interval, 0.0, cadence
+
+    @callback
+    def async_apply_options(self, changed):
+        """Apply changed (non-structural) options in place, without a reload.
+
+        The slot plan recompiles on the next access, only the entities that
+        came or went are (un)subscribed and the rotation clock restarts only
+        if its interval or source changed. A keyframe follows right away.
+        """
+        options = self.entry.options
+        update_interval, debounce, cadence = self._timing(options)
+        self.update_interval = timedelta(seconds=update_interval)
+        self._debounced_refresh.cooldown = debounce
+        self.cadence = cadence
+
+        self.delta_encoding = bool(options.get(CONF_DELTA_ENCODING, True))
+        self._delta.keyframe_interval = int(options.get(CONF_KEYFRAME_INTERVAL, DEFAULT_KEYFRAME_INTERVAL))
+        self._delta.invalidate()
+
+        self._async_sync_rotation()
+        self._async_sync_state_tracking()
+        _LOGGER.debug("Optionen ohne Reload übernommen: %s", ", ".join(sorted(changed)))
+        self.hass.async_create_task(self.async_request_refresh())
+
+    async def async_restore_state(self):
+        """Load the rotation state saved by a previous run."""
+        stored = await self._page_store.async_load()
+        if stored:
+            self.current_page = stored.get("page", self.current_page)
+        stored = await self._frame_store.async_load()
+        if stored:
+            self.last_frames = stored.get("frames", {})
+
+    async def async_save_state(self):
+        """Write the rotation state and the last frames now (on unload)."""
+        await self._page_store.async_save(self._page_state())
+        if self.live:
+            await self._frame_store.async_save(self._frame_state())
+
+    @callback
+    def _async_schedule_page_save(self):
+        """Persist the page at most every PAGE_SAVE_DELAY seconds (not in the config entry)."""
+        # async_delay_save restarts its timer on every call, so only arm it once
+        if not self._page_save_pending:
+            self._page_save_pending = True
+            self._page_store.async_delay_save(self._page_state, PAGE_SAVE_DELAY)
+
+    @callback
+    def _page_state(self):
+        """Return the rotation state to persist."""
+        self._page_save_pending = False
+        return {"page": self.current_page}
+
+    @callback
+    def _async_schedule_frame_save(self):
+        """Persist the last frames at most every FRAME_SAVE_DELAY seconds."""
+        if not self._frame_save_pending:
+            self._frame_save_pending = True
+            self._frame_store.async_delay_save(self._frame_state, FRAME_SAVE_DELAY)
+
+    @callback
+    def _frame_state(self):
+        """Return the last frames to persist."""
+        self._frame_save_pending = False
+        return {"frames": self.last_frames}
+
     def _dummy_listener(self):
         """Dummy listener to keep DataUpdateCoordinator polling active."""
         pass
 
+    @property
+    def slot_plan(self):
+        """Return the slot plan, recompiled whenever the options object changes."""
+        if self._slot_plan is None or self._slot_plan.options is not self.entry.options:
+            self._slot_plan = SlotPlan(self.entry.options)
+            # Broadcast mode may have changed
+            self.target_resolver.invalidate()
+        return self._slot_plan
+
+    @property
+    def tracked_entity_ids(self):
+        """Return the configured source entities."""
+        return list(self.slot_plan.entity_ids)
+
+    @property
+    def ha_rotation_active(self):
+        """Return True if Home Assistant drives the page rotation."""
+        plan = self.slot_plan
+        return plan.switch_mode != PAGE_SWITCH_TOUCH and plan.rotation_source == "ha"
+
+    @callback
+    def async_start_tracking(self):
+        """Subscribe to ESPHome reconnects and, in event mode, the configured entities."""
+        self.async_stop_tracking()
+        self.device_resolver.async_setup()
+        self._unsub_tracking.append(self.device_resolver.async_shutdown)
+        self.target_resolver.async_setup()
+        self._unsub_tracking.append(self.target_resolver.async_shutdown)
+
+        # Latest firmware version is checked in the background, outside the push tick
+        self.version_service.async_start()
+        self._unsub_tracking.append(self.version_service.async_release)
+        self._unsub_tracking.append(self.version_service.async_add_listener(self.async_update_listeners))
+
+        # ESPHome (re-)registers its services whenever a display (re)connects
+        self._unsub_tracking.append(
+            self.hass.bus.async_listen(EVENT_SERVICE_REGISTERED, self._async_handle_service_registered)
+        )
+
+        # Page rotation runs on its own clock, independent of the data cadence
+        self._async_sync_rotation()
+        self._async_sync_state_tracking()
+
+        if self.event_driven:
+            _LOGGER.debug("Event-Modus aktiv: %s Entitäten werden verfolgt", len(self._unsub_states))
+
+    @callback
+    def async_stop_tracking(self):
+        """Remove all state and timer subscriptions."""
+        while self._unsub_tracking:
+            self._unsub_tracking.pop()()
+        while self._unsub_states:
+            self._unsub_states.popitem()[1]()
+        if self._rotation is not None:
+            self._rotation.async_stop()
+            self._rotation = None
+
+    @callback
+    def _async_sync_rotation(self):
+        """Run the rotation clock while Home Assistant drives the pages, at the configured interval."""
+        active = self.ha_rotation_active
+        interval = self.slot_plan.page_interval
+        if self._rotation is not None and (not active or self._rotation.interval != interval):
+            self._rotation.async_stop()
+            self._rotation = None
+        if active and self._rotation is None:
+            self._rotation = PageRotationScheduler(self.hass, interval, self._async_handle_rotation_tick)
+            self._rotation.async_start()
+
+    @callback
+    def _async_sync_state_tracking(self):
+        """In event mode, subscribe to the configured entities that are not tracked yet and drop the others."""
+        wanted = set(self.tracked_entity_ids) if self.event_driven else set()
+        for entity_id in self._unsub_states.keys() - wanted:
+            self._unsub_states.pop(entity_id)()
+        for entity_id in wanted - self._unsub_states.keys():
+            self._unsub_states[entity_id] = async_track_state_change_event(
+                self.hass, entity_id, self._async_handle_state_change
+            )
+
+    async def async_shutdown(self):
+        """Cancel the pushes in flight, then stop the coordinator."""
+        for channel in self.channels.values():
+            channel.async_cancel()
+        await super().async_shutdown()
+
+    @callback
+    def _async_handle_state_change(self, event):
+        """Schedule a debounced push when a tracked value really changed."""
+        old_state = event.data.get("old_state")
+        new_state = event.data.get("new_state")
+        if (
+            old_state is not None
+            and new_state is not None
+            and old_state.state == new_state.state
+            and old_state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) == new_state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+        ):
+            # Attribute-only update (e.g. last_reset), nothing on the display changes
+            return
+        self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def _async_handle_service_registered(self, event):
+        """Force a keyframe for a display whose services were just registered."""
+        if event.data.get(ATTR_DOMAIN) != "esphome":
+            return
+        service = event.data.get(ATTR_SERVICE, "")
+        if service.endswith(DELTA_SERVICE_SUFFIX):
+            service = service[: -len(DELTA_SERVICE_SUFFIX)]
+        if service.endswith("_update_display"):
+            _LOGGER.debug("ESPHome-Dienst %s (neu) registriert, nächster Push ist ein Keyframe", service)
+            self._delta.invalidate(service)
+            # The display is back, probe it with the next frame instead of waiting for the backoff
+            if service in self.channels:
+                self.channels[service].async_reset()
+            # Still starting up: show the last frame right away instead of waiting for the sources
+            if not self.live and service in self.last_frames:
+                self._channel(service).async_submit(self._cached_frame(service))
+
+    @callback
+    def _async_handle_rotation_tick(self):
+        """Advance the page on the rotation clock and send just the flip."""
+        enabled_pages = self.slot_plan.enabled_pages
+        if self.current_page in enabled_pages:
+            idx = enabled_pages.index(self.current_page)
+            self.current_page = enabled_pages[(idx + 1) % len(enabled_pages)]
+        else:
+            self.current_page = enabled_pages[0]
+
+        self._async_schedule_page_save()
+        self.hass.async_create_background_task(self._async_push_page(), f"{DOMAIN} page flip")
+
     async def _async_update_data(self):
         """Fetch data from entities and push to ESP32."""
-        data = {}
-        
-        def get_value(entity_id):
-            if not entity_id:
-                return None
-            state = self.hass.states.get(entity_id)
-            if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-                return None
-            try:
-                return round(float(state.state), 1)
-            except (ValueError, TypeError):
-                return None
-
-        # --- Discover ESPHome Entity ---
-        esphome_update_id = None
-        ota_service_name = None
-        installed_ver = "1.2.7"
-        
-        target_host = self.entry.data.get(CONF_HOST)
-        _LOGGER.debug("Suche nach ESPHome-Gerät für Host %s", target_host)
+        started = time.monotonic()
+        data = await self._async_tick()
+        self.last_tick_duration = time.monotonic() - started
+        self.metrics.add(PHASE_TICK, self.last_tick_duration)
+        data["tick_duration"] = round(self.last_tick_duration, 4)
+        data["push_stats"] = {srv: asdict(stats) for srv, stats in self.push_stats.items()}
+        data["display_health"] = {srv: channel.as_dict() for srv, channel in self.channels.items()}
+        if self.cadence is not None:
+            # Picked up when the coordinator schedules the next refresh
+            self.update_interval = timedelta(seconds=self.cadence.update(data["frame"]))
+        data["update_interval"] = self.update_interval.total_seconds()
+        return data
 
-        # 1. Finde den Config Entry von ESPHome für diese IP
-        esphome_entry = next((e for e in self.hass.config_entries.async_entries("esphome") if e.data.get("host") == target_host), None)
-        
-        if esphome_entry:
-            device_name = esphome_entry.title.lower().replace(" ", "_").replace("-", "_")
-            ota_service_name = f"{device_name}_trigger_ota_update"
-            _LOGGER.debug("ESPHome Eintrag gefunden: %s, Dienst: %s", esphome_entry.title, ota_service_name)
-            
-            # 2. Durchsuche alle Entitäten nach einer Update-Entität für diesen Eintrag
-            from homeassistant.helpers import entity_registry as er
-            ent_reg = er.async_get(self.hass)
-            
-            for entity in er.async_entries_for_config_entry(ent_reg, esphome_entry.entry_id):
-                if entity.domain == "update":
-                    esphome_update_id = entity.entity_id
-                    _LOGGER.info("Gefundene Ziel-Entität für Updates: %s", esphome_update_id)
-                    
-                    state = self.hass.states.get(esphome_update_id)
-                    if state:
-                        installed_ver = state.attributes.get("installed_version", "1.2.7")
-                    break
-        else:
-            _LOGGER.warning("Kein ESPHome-Gerät für Host %s gefunden. Update-Funktion eingeschränkt.", target_host)
+    async def _async_tick(self):
+        """Build the frame and push it to all targets."""
+        plan = self.slot_plan
 
-        # --- Version Check Logic ---
-        await self.async_check_version()
-        # ---------------------------
+        # --- Discover ESPHome Entity and target services (cached, see resolver.py) ---
+        with self.metrics.measure(PHASE_DISCOVERY):
+            device = self.device_resolver.async_get()
+            target_services = self.target_resolver.async_get()
+        esphome_update_id = device.update_entity_id if device else None
+        ota_service_name = device.ota_service if device else None
+        installed_ver = "1.2.7"
+
+        if esphome_update_id:
+            state = self.hass.states.get(esphome_update_id)
+            if state:
+                installed_ver = state.attributes.get("installed_version", "1.2.7")
 
         data = {
             "latest_version": self.latest_version,
@@ -190,322 +405,163 @@ class CYDSolarCoordinator(DataUpdateCoordinator):
             "esphome_update_entity": esphome_update_id,
             "ota_service": ota_service_name
         }
-        def get_custom_val(entity_id):
-            if not entity_id:
-                return ""
-            state = self.hass.states.get(entity_id)
-            if state is None or state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-                return "--"
-            val = state.state
-            try:
-                fval = float(val)
-                if fval.is_integer():
-                    val = f"{int(fval)}"
-                else:
-                    val = f"{round(fval, 2)}"
-            except ValueError:
-                pass
-            unit = state.attributes.get("unit_of_measurement", "")
-            return f"{val} {unit}".strip()
 
         # Gather data
-        payload = {
-            "solar_w": get_value(self.entry.options.get(CONF_SOLAR_ENTITY)),
-            "grid_w": get_value(self.entry.options.get(CONF_GRID_ENTITY)),
-            "house_w": get_value(self.entry.options.get(CONF_HOUSE_ENTITY)),
-            "battery_w": get_value(self.entry.options.get(CONF_BATTERY_ENTITY)),
-            "battery_soc": get_value(self.entry.options.get(CONF_BATTERY_SOC_ENTITY)),
-            "yield_today_kwh": get_value(self.entry.options.get(CONF_YIELD_TODAY_ENTITY)),
-            "yield_month_kwh": get_value(self.entry.options.get(CONF_YIELD_MONTH_ENTITY)),
-            "yield_year_kwh": get_value(self.entry.options.get(CONF_YIELD_YEAR_ENTITY)),
-            "yield_total_kwh": get_value(self.entry.options.get(CONF_YIELD_TOTAL_ENTITY)),
-            "grid_import_kwh": get_value(self.entry.options.get(CONF_GRID_IMPORT_ENTITY)),
-            "grid_export_kwh": get_value(self.entry.options.get(CONF_GRID_EXPORT_ENTITY)),
-            "timestamp": datetime.now().isoformat(),
-            
-            "c1_n": self.entry.options.get(CONF_CUSTOM1_NAME, "Custom 1"),
-            "c1_v": get_custom_val(self.entry.options.get(CONF_CUSTOM1_ENTITY)),
-            "c2_n": self.entry.options.get(CONF_CUSTOM2_NAME, "Custom 2"),
-            "c2_v": get_custom_val(self.entry.options.get(CONF_CUSTOM2_ENTITY)),
-            "c3_n": self.entry.options.get(CONF_CUSTOM3_NAME, "Custom 3"),
-            "c3_v": get_custom_val(self.entry.options.get(CONF_CUSTOM3_ENTITY)),
-            "c4_n": self.entry.options.get(CONF_CUSTOM4_NAME, "Custom 4"),
-            "c4_v": get_custom_val(self.entry.options.get(CONF_CUSTOM4_ENTITY)),
-            
-            "c5_n": self.entry.options.get(CONF_CUSTOM5_NAME, "Custom 5"),
-            "c5_v": get_custom_val(self.entry.options.get(CONF_CUSTOM5_ENTITY)),
-            "c6_n": self.entry.options.get(CONF_CUSTOM6_NAME, "Custom 6"),
-            "c6_v": get_custom_val(self.entry.options.get(CONF_CUSTOM6_ENTITY)),
-            "c7_n": self.entry.options.get(CONF_CUSTOM7_NAME, "Custom 7"),
-            "c7_v": get_custom_val(self.entry.options.get(CONF_CUSTOM7_ENTITY)),
-            "c8_n": self.entry.options.get(CONF_CUSTOM8_NAME, "Custom 8"),
-            "c8_v": get_custom_val(self.entry.options.get(CONF_CUSTOM8_ENTITY)),
-            
-            "c9_n": self.entry.options.get(CONF_MINING1_NAME, "Mining 1"),
-            "c9_v": get_custom_val(self.entry.options.get(CONF_MINING1_ENTITY)),
-            "c10_n": self.entry.options.get(CONF_MINING2_NAME, "Mining 2"),
-            "c10_v": get_custom_val(self.entry.options.get(CONF_MINING2_ENTITY)),
-            "c11_n": self.entry.options.get(CONF_MINING3_NAME, "Mining 3"),
-            "c11_v": get_custom_val(self.entry.options.get(CONF_MINING3_ENTITY)),
-            "c12_n": self.entry.options.get(CONF_MINING4_NAME, "Mining 4"),
-            "c12_v": get_custom_val(self.entry.options.get(CONF_MINING4_ENTITY)),
-
-            "c13_n": self.entry.options.get(CONF_CUSTOM9_NAME, "Custom 9"),
-            "c13_v": get_custom_val(self.entry.options.get(CONF_CUSTOM9_ENTITY)),
-            "c14_n": self.entry.options.get(CONF_CUSTOM10_NAME, "Custom 10"),
-            "c14_v": get_custom_val(self.entry.options.get(CONF_CUSTOM10_ENTITY)),
-            "c15_n": self.entry.options.get(CONF_CUSTOM11_NAME, "Custom 11"),
-            "c15_v": get_custom_val(self.entry.options.get(CONF_CUSTOM11_ENTITY)),
-            "c16_n": self.entry.options.get(CONF_CUSTOM12_NAME, "Custom 12"),
-            "c16_v": get_custom_val(self.entry.options.get(CONF_CUSTOM12_ENTITY)),
-
-            "c17_n": self.entry.options.get(CONF_CUSTOM13_NAME, "Custom 13"),
-            "c17_v": get_custom_val(self.entry.options.get(CONF_CUSTOM13_ENTITY)),
-            "c18_n": self.entry.options.get(CONF_CUSTOM14_NAME, "Custom 14"),
-            "c18_v": get_custom_val(self.entry.options.get(CONF_CUSTOM14_ENTITY)),
-            "c19_n": self.entry.options.get(CONF_CUSTOM15_NAME, "Custom 15"),
-            "c19_v": get_custom_val(self.entry.options.get(CONF_CUSTOM15_ENTITY)),
-            "c20_n": self.entry.options.get(CONF_CUSTOM16_NAME, "Custom 16"),
-            "c20_v": get_custom_val(self.entry.options.get(CONF_CUSTOM16_ENTITY)),
-
-            "c21_n": self.entry.options.get(CONF_CUSTOM17_NAME, "Custom 17"),
-            "c21_v": get_custom_val(self.entry.options.get(CONF_CUSTOM17_ENTITY)),
-            "c22_n": self.entry.options.get(CONF_CUSTOM18_NAME, "Custom 18"),
-            "c22_v": get_custom_val(self.entry.options.get(CONF_CUSTOM18_ENTITY)),
-            "c23_n": self.entry.options.get(CONF_CUSTOM19_NAME, "Custom 19"),
-            "c23_v": get_custom_val(self.entry.options.get(CONF_CUSTOM19_ENTITY)),
-            "c24_n": self.entry.options.get(CONF_CUSTOM20_NAME, "Custom 20"),
-            "c24_v": get_custom_val(self.entry.options.get(CONF_CUSTOM20_ENTITY)),
-
-            "c25_n": self.entry.options.get(CONF_CUSTOM21_NAME, "Custom 21"),
-            "c25_v": get_custom_val(self.entry.options.get(CONF_CUSTOM21_ENTITY)),
-            "c26_n": self.entry.options.get(CONF_CUSTOM22_NAME, "Custom 22"),
-            "c26_v": get_custom_val(self.entry.options.get(CONF_CUSTOM22_ENTITY)),
-            "c27_n": self.entry.options.get(CONF_CUSTOM23_NAME, "Custom 23"),
-            "c27_v": get_custom_val(self.entry.options.get(CONF_CUSTOM23_ENTITY)),
-            "c28_n": self.entry.options.get(CONF_CUSTOM24_NAME, "Custom 24"),
-            "c28_v": get_custom_val(self.entry.options.get(CONF_CUSTOM24_ENTITY)),
-        }
+        with self.metrics.measure(PHASE_GATHER):
+            service_data = plan.build(self.hass.states)
 
-        # Handle Page Switching
-        enable_p1 = self.entry.options.get(CONF_ENABLE_PAGE1, True)
-        enable_p2 = self.entry.options.get(CONF_ENABLE_PAGE2, True)
-        enable_p3 = self.entry.options.get(CONF_ENABLE_PAGE3, True)
-        enable_p4 = self.entry.options.get(CONF_ENABLE_PAGE4, True)
-        enable_p5 = self.entry.options.get(CONF_ENABLE_PAGE5, True)
-        enable_p6 = self.entry.options.get(CONF_ENABLE_PAGE6, False)
-        enable_p7 = self.entry.options.get(CONF_ENABLE_PAGE7, False)
-        enable_p8 = self.entry.options.get(CONF_ENABLE_PAGE8, False)
-        enable_p9 = self.entry.options.get(CONF_ENABLE_PAGE9, False)
-        
-        enabled_pages = []
-        if enable_p1: enabled_pages.append(1)
-        if enable_p2: enabled_pages.append(2)
-        if enable_p3: enabled_pages.append(3)
-        if enable_p4: enabled_pages.append(4)
-        if enable_p5: enabled_pages.append(5)
-        if enable_p6: enabled_pages.append(6)
-        if enable_p7: enabled_pages.append(7)
-        if enable_p8: enabled_pages.append(8)
-        if enable_p9: enabled_pages.append(9)
-        
-        if not enabled_pages: enabled_pages = [1]
-        
-        # Seitenwechsel-Modus auslesen
-        switch_mode = self.entry.options.get(CONF_PAGE_SWITCH_MODE, PAGE_SWITCH_AUTO)
-        rotation_source = self.entry.options.get(CONF_PAGE_ROTATION_SOURCE, "ha")
-        
-        try:
-            interval = int(self.entry.options.get("page_interval", 10))
-        except (ValueError, TypeError):
-            interval = 10
-        
-        # Ensure our current page is valid
-        # Ensure our current page is valid, and handle first-boot injection
+        # Pages are flipped by the rotation clock (see _async_handle_rotation_tick), never here
+        with self.metrics.measure(PHASE_ROTATION):
+            self._async_apply_page(service_data)
+        data["frame"] = service_data
+
+        # Call the ESPHome Service(s)
+        data["service_resolution"] = self.target_resolver.as_dict()
+        if not target_services:
+            return data
+
+        # Right after a restart the sources are still loading: keep the last frames
+        # on the displays instead of a frame of zeros, until a live value arrives
+        if not self.live and plan.sources_ready(self.hass.states):
+            self.live = True
+
+        with self.metrics.measure(PHASE_DISPATCH):
+            if self.live:
+                frames = {srv: service_data for srv in target_services}
+            else:
+                frames = {srv: self._cached_frame(srv) or service_data for srv in target_services}
+            # The first refresh must not hold up startup, it does not wait for the displays
+            await self._async_push_all(target_services, frames, wait=self.data is not None)
+        return data
+
+    def _cached_frame(self, srv):
+        """Return the last frame pushed to a display on the current page, or None."""
+        frame = self.last_frames.get(srv)
+        if frame is None:
+            return None
+        frame = dict(frame)
+        self._async_apply_page(frame)
+        return frame
+
+    @callback
+    def _async_apply_page(self, frame):
+        """Write the current page into a frame, falling back to the first enabled page."""
+        enabled_pages = self.slot_plan.enabled_pages
         if self.current_page not in enabled_pages:
             self.current_page = enabled_pages[0]
-            
-        if switch_mode == PAGE_SWITCH_TOUCH:
-            # Nur Touch-Modus: HA rotiert nicht automatisch.
-            # Wenn die Seite noch nicht gesetzt wurde, nimm die erste.
-            if self.current_page is None:
-                self.current_page = enabled_pages[0]
-            self.last_page_switch = datetime.now()  # Intervall-Timer zuruecksetzen
-        elif rotation_source == "ha":
-            # Auto oder Both, und HA ist Master: HA rotiert Seiten nach Intervall
-            # Check if first launch OR time has passed
-            time_since = (datetime.now() - self.last_page_switch).total_seconds()
-            
-            if time_since >= interval:
-                idx = enabled_pages.index(self.current_page)
-                self.current_page = enabled_pages[(idx + 1) % len(enabled_pages)]
-                self.last_page_switch = datetime.now()
-                
-                # Persist page in options
-                if self.entry.options.get("last_page") != self.current_page:
-                    new_options = dict(self.entry.options)
-                    new_options["last_page"] = self.current_page
-                    new_options["_last_sync"] = datetime.now().timestamp() # Trigger update
-                    self.hass.config_entries.async_update_entry(self.entry, options=new_options)
-            
-        page_idx = enabled_pages.index(self.current_page) + 1
-        page_total = len(enabled_pages)
-        
-        # Data for Service Call
-        service_data = {
-            "solar": float(payload["solar_w"] or 0.0),
-            "grid": float(payload["grid_w"] or 0.0),
-            "house": float(payload["house_w"] or 0.0),
-            "bat_w": float(payload["battery_w"] or 0.0),
-            "bat_soc": float(payload["battery_soc"] or 0.0),
-            "val_yield": float(payload["yield_today_kwh"] or 0.0),
-            "val_yield_month": float(payload["yield_month_kwh"] or 0.0),
-            "val_yield_year": float(payload["yield_year_kwh"] or 0.0),
-            "val_yield_total": float(payload["yield_total_kwh"] or 0.0),
-            "grid_in": float(payload["grid_import_kwh"] or 0.0),
-            "grid_out": float(payload["grid_export_kwh"] or 0.0),
-            "page_num": int(self.current_page),
-            "auto_rotate": bool(rotation_source == "display" and switch_mode != PAGE_SWITCH_TOUCH),
-            "page_idx": int(page_idx),
-            "page_total": int(page_total),
-            "show_kw": bool(self.entry.options.get(CONF_SHOW_KW, False)),
-            "c1_n": str(payload["c1_n"] or " "),
-            "c1_v": str(payload["c1_v"] or " "),
-            "c2_n": str(payload["c2_n"] or " "),
-            "c2_v": str(payload["c2_v"] or " "),
-            "c3_n": str(payload["c3_n"] or " "),
-            "c3_v": str(payload["c3_v"] or " "),
-            "c4_n": str(payload["c4_n"] or " "),
-            "c4_v": str(payload["c4_v"] or " "),
-            "c5_n": str(payload["c5_n"] or " "),
-            "c5_v": str(payload["c5_v"] or " "),
-            "c6_n": str(payload["c6_n"] or " "),
-            "c6_v": str(payload["c6_v"] or " "),
-            "c7_n": str(payload["c7_n"] or " "),
-            "c7_v": str(payload["c7_v"] or " "),
-            "c8_n": str(payload["c8_n"] or " "),
-            "c8_v": str(payload["c8_v"] or " "),
-            "c9_n": str(payload["c9_n"] or " "),
-            "c9_v": str(payload["c9_v"] or " "),
-            "c10_n": str(payload["c10_n"] or " "),
-            "c10_v": str(payload["c10_v"] or " "),
-            "c11_n": str(payload["c11_n"] or " "),
-            "c11_v": str(payload["c11_v"] or " "),
-            "c12_n": str(payload["c12_n"] or " "),
-            "c12_v": str(payload["c12_v"] or " "),
-            "c13_n": str(payload["c13_n"] or " "),
-            "c13_v": str(payload["c13_v"] or " "),
-            "c14_n": str(payload["c14_n"] or " "),
-            "c14_v": str(payload["c14_v"] or " "),
-            "c15_n": str(payload["c15_n"] or " "),
-            "c15_v": str(payload["c15_v"] or " "),
-            "c16_n": str(payload["c16_n"] or " "),
-            "c16_v": str(payload["c16_v"] or " "),
-            "c17_n": str(payload["c17_n"] or " "),
-            "c17_v": str(payload["c17_v"] or " "),
-            "c18_n": str(payload["c18_n"] or " "),
-            "c18_v": str(payload["c18_v"] or " "),
-            "c19_n": str(payload["c19_n"] or " "),
-            "c19_v": str(payload["c19_v"] or " "),
-            "c20_n": str(payload["c20_n"] or " "),
-            "c20_v": str(payload["c20_v"] or " "),
-            "c21_n": str(payload["c21_n"] or " "),
-            "c21_v": str(payload["c21_v"] or " "),
-            "c22_n": str(payload["c22_n"] or " "),
-            "c22_v": str(payload["c22_v"] or " "),
-            "c23_n": str(payload["c23_n"] or " "),
-            "c23_v": str(payload["c23_v"] or " "),
-            "c24_n": str(payload["c24_n"] or " "),
-            "c24_v": str(payload["c24_v"] or " "),
-            "c25_n": str(payload["c25_n"] or " "),
-            "c25_v": str(payload["c25_v"] or " "),
-            "c26_n": str(payload["c26_n"] or " "),
-            "c26_v": str(payload["c26_v"] or " "),
-            "c27_n": str(payload["c27_n"] or " "),
-            "c27_v": str(payload["c27_v"] or " "),
-            "c28_n": str(payload["c28_n"] or " "),
-            "c28_v": str(payload["c28_v"] or " "),
-            "dim_start": int(self.entry.options.get("dim_start_time", 22)),
-            "dim_end": int(self.entry.options.get("dim_end_time", 6)),
-            "dim_brt": float(self.entry.options.get("dim_brightness", 20.0)),
-            "p1_en": bool(enable_p1),
-            "p2_en": bool(enable_p2),
-            "p3_en": bool(enable_p3),
-            "p4_en": bool(enable_p4),
-            "p5_en": bool(enable_p5),
-            "p6_en": bool(enable_p6),
-            "p7_en": bool(enable_p7),
-            "p8_en": bool(enable_p8),
-            "p9_en": bool(enable_p9),
-        }
-        
-        # Call the ESPHome Service(s)
-        all_services = self.hass.services.async_services()
-        esphome_services = all_services.get("esphome", {})
-        
-        target_services = []
-        broadcast = self.entry.options.get(CONF_BROADCAST_MODE, False)
-        
-        # 1. Collect all potential services
-        all_solar_services = [s for s in esphome_services if s.startswith("cyd_solar_display_") and s.endswith("_update_display")]
-        if "cyd_solar_display_update_display" in esphome_services and "cyd_solar_display_update_display" not in all_solar_services:
-            all_solar_services.append("cyd_solar_display_update_display")
+        frame["page_num"] = int(self.current_page)
+        frame["page_idx"] = enabled_pages.index(self.current_page) + 1
 
-        if broadcast:
-            target_services = all_solar_services
-        else:
-            # Specific Mode: Target only the display matching the configured IP (host)
-            target_host = self.entry.data.get(CONF_HOST)
-            for entry in self.hass.config_entries.async_entries("esphome"):
-                if entry.data.get("host") == target_host:
-                    name_data = entry.data.get("name", "")
-                    title_data = entry.title
-                    
-                    possible_names = [name_data, title_data]
-                    for d_name in possible_names:
-                        if d_name:
-                            srv = f"{str(d_name).lower().replace('-', '_').replace(' ', '_')}_update_display"
-                            if srv in esphome_services:
-                                target_services = [srv]
-                                break
-                if target_services:
-                    break
-        
-        # Fallback: If specific targeting fails but only one generic service exists, use it!
-        if not target_services and len(all_solar_services) == 1:
-            target_services = all_solar_services
-            _LOGGER.debug(f"Calling only service {target_services[0]} as specific match failed but 1 display exists")
-        elif not target_services and len(all_solar_services) > 1:
-            _LOGGER.error("MEHRERE DISPLAYS gefunden, aber IP/Host '%s' passt zu keinem ESPHome-Gerät! Aus Sicherheitsgründen wird nichts gesendet.", target_host)
-            return payload
+    async def _async_push_page(self):
+        """Flip the page on the displays by re-sending the last frame, without gathering data."""
+        frame = self.data.get("frame") if self.data else None
+        if frame is None:
+            await self.async_request_refresh()
+            return
+        frame = dict(frame)
+        self._async_apply_page(frame)
+        self.data["frame"] = frame
+        target_services = self.target_resolver.async_get()
+        if target_services:
+            await self._async_push_all(target_services, {srv: frame for srv in target_services})
 
-        if not target_services:
-            _LOGGER.warning(
-                "Kein CYD Solar Display in ESPHome gefunden (oder noch 'entdeckt' aber nicht hinzugefügt). "
-                "Bitte klicke in der ESPHome Integration bei den Displays auf 'Hinzufügen'."
+    def target_available(self, srv):
+        """Return True if a display service takes pushes, None before its first push."""
+        channel = self.channels.get(srv)
+        return None if channel is None else channel.breaker.available
+
+    def _channel(self, srv):
+        """Return the push channel of one display service."""
+        channel = self.channels.get(srv)
+        if channel is None:
+            channel = self.channels[srv] = DisplayChannel(
+                self.hass, srv, self._async_send, self.metrics, on_change=self.async_update_listeners
             )
-            return payload
-                
+        return channel
+
+    async def _async_push_all(self, target_services, frames, wait=True):
+        """Hand each target its frame and wait for the calls it started.
+
+        A display that still works on an earlier call only gets the frame
+        queued (replacing an older queued one), one with an open circuit
+        breaker is skipped until its next probe, so neither holds up the tick.
+        """
+        plan = self.slot_plan
+        keys = plan.page_keys.get(self.current_page) if plan.page_scoped else None
+        started = []
         for srv in target_services:
-            try:
-                await self.hass.services.async_call("esphome", srv, service_data)
-            except Exception as err:
-                _LOGGER.error("Could not call ESPHome service '%s': %s", srv, err)
+            done = self._channel(srv).async_submit(frames[srv], keys)
+            if done is not None:
+                started.append(done)
+        if started and wait:
+            await asyncio.gather(*started)
+
+    async def _async_send(self, srv, service_data, keys):
+        """Push to one target from its channel, returns False on failure."""
+        ok = await self._async_push_target(srv, service_data, srv in self.target_resolver.delta_capable, keys)
+        if ok and self.live:
+            self.last_frames[srv] = service_data
+            self._async_schedule_frame_save()
+        return ok
+
+    async def _async_push_target(self, srv, service_data, delta_capable, keys=None):
+        """Push to one target and account for the result; never raises, returns False on failure."""
+        stats = self.push_stats.setdefault(srv, PushStats())
+        stats.calls += 1
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(self.push_timeout):
+                sent = await self._async_push_frame(srv, service_data, delta_capable, keys)
+            self.metrics.count(COUNTER_PUSHES if sent else COUNTER_SKIPPED)
+            return True
+        except TimeoutError:
+            stats.timeouts += 1
+            stats.last_error = f"timeout after {self.push_timeout} s"
+            self._delta.invalidate(srv)
+            self.metrics.count(COUNTER_FAILURES)
+            # The channel logs when the display goes offline or recovers, not every failed call
+            _LOGGER.debug("ESPHome service '%s' did not answer within %s s", srv, self.push_timeout)
+            return False
+        except Exception as err:
+            stats.errors += 1
+            stats.last_error = str(err)
+            self._delta.invalidate(srv)
+            self.metrics.count(COUNTER_FAILURES)
+            _LOGGER.debug("Could not call ESPHome service '%s': %s", srv, err)
+            return False
+        finally:
+            duration = time.monotonic() - started
+            stats.last_duration = round(duration, 4)
+            self.metrics.add_target(srv, duration)
+
+    async def _async_push_frame(self, srv, service_data, delta_capable, keys=None):
+        """Send a frame to one display, as a delta if the firmware supports it.
+
+        With keys (page-scoped payloads) a delta only carries those fields; the
+        fields of the next page follow just in time when it becomes visible.
+        Returns False if nothing had to be sent.
+        """
+        delta_srv = delta_service_name(srv)
+        if not self.delta_encoding or not delta_capable:
+            await self.hass.services.async_call("esphome", srv, service_data, blocking=True)
+            return True
+
+        changed = self._delta.diff(srv, service_data, keys)
+        if changed is None:
+            await self.hass.services.async_call("esphome", srv, service_data, blocking=True)
+            self._delta.commit(srv, service_data, keyframe=True)
+        elif changed:
+            await self.hass.services.async_call(
+                "esphome", delta_srv, {"data": json.dumps(changed, separators=(",", ":"))}, blocking=True
+            )
+            self._delta.commit(srv, changed)
+        return changed is None or bool(changed)
 
-        return payload
+    @property
+    def latest_version(self):
+        """Latest firmware version, shared by all entries."""
+        return self.version_service.latest_version
 
     async def async_check_version(self, force=False):
-        """Fetch latest version from GitHub."""
-        now = datetime.now()
-        if force or self.latest_version == "0.0.0" or self.last_version_check is None or (now - self.last_version_check).total_seconds() > 60:
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(self.version_url, timeout=5) as response:
-                        if response.status == 200:
-                            self.latest_version = (await response.text()).strip()
-                            self.last_version_check = now
-                            _LOGGER.debug("Latest GitHub version: %s", self.latest_version)
-                            return True
-            except Exception as e:
-                _LOGGER.warning("Failed to fetch version from GitHub: %s", e)
-        return False
+        """Fetch latest version from GitHub (outside of the push tick)."""
+        return await self.version_service.async_refresh(force=force)
@@ -0,0 +1,57 @@
+"""Delta encoding of display frames for the CYD Solar Display integration."""
+import time
+
+# The partial-update service is the normal update service plus this suffix,
+# e.g. esphome.cyd_solar_display_update_display_delta(data: string)
+DELTA_SERVICE_SUFFIX = "_delta"
+
+
+def delta_service_name(service):
+    """Return the partial-update variant of an update_display service."""
+    return f"{service}{DELTA_SERVICE_SUFFIX}"
+
+
+class DeltaEncoder:
+    """Remember the last frame sent to each target and compute the changes."""
+
+    def __init__(self, keyframe_interval, clock=time.monotonic):
+        """Initialize, clock is the monotonic time source (the coordinator passes loop.time)."""
+        self.keyframe_interval = keyframe_interval
+        self._clock = clock
+        self._last_frames = {}
+        self._last_keyframe = {}
+
+    def diff(self, target, frame, keys=None):
+        """Return the changed fields (limited to keys, if given), or None if a full keyframe is due.
+
+        Fields outside keys keep their last delivered value, so they show up
+        in the diff as soon as they are in scope again.
+        """
+        last = self._last_frames.get(target)
+        if last is None:
+            return None
+
+        sent_at = self._last_keyframe.get(target, 0.0)
+        if self._clock() - sent_at >= self.keyframe_interval:
+            return None
+
+        if keys is None:
+            return {key: value for key, value in frame.items() if last.get(key) != value}
+        return {key: frame[key] for key in keys if key in frame and last.get(key) != frame[key]}
+
+    def commit(self, target, frame, keyframe=False):
+        """Remember a frame that was delivered successfully."""
+        if keyframe:
+            self._last_frames[target] = dict(frame)
+            self._last_keyframe[target] = self._clock()
+        else:
+            self._last_frames.setdefault(target, {}).update(frame)
+
+    def invalidate(self, target=None):
+        """Forget the state of one (or all) targets so the next push is a keyframe."""
+        if target is None:
+            self._last_frames.clear()
+            self._last_keyframe.clear()
+            return
+        self._last_frames.pop(target, None)
+        self._last_keyframe.pop(target, None)
@@ -0,0 +1,29 @@
+"""Diagnostics support for the CYD Solar Display integration."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_HOST
+
+TO_REDACT = {CONF_HOST}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    data = coordinator.data or {}
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "push_mode": "event" if coordinator.event_driven else "poll",
+        "update_interval": coordinator.update_interval.total_seconds(),
+        "current_page": coordinator.current_page,
+        "last_update_success": coordinator.last_update_success,
+        "metrics": coordinator.metrics.as_dict(),
+        "push_stats": data.get("push_stats", {}),
+        "display_health": data.get("display_health", {}),
+        "service_resolution": data.get("service_resolution"),
+        "frame": data.get("frame"),
+    }
@@ -0,0 +1,177 @@
+"""Content-addressed on-disk firmware cache for the CYD Solar Display integration."""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+import uuid
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, FIRMWARE_CACHE_MAX_BYTES
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_FIRMWARE_CACHE = "firmware_cache"
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.firmware_cache"
+CHUNK_SIZE = 64 * 1024
+
+
+@callback
+def async_get_firmware_cache(hass):
+    """Return the shared firmware cache, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_FIRMWARE_CACHE not in domain_data:
+        domain_data[DATA_FIRMWARE_CACHE] = FirmwareCache(hass, hass.config.path(DOMAIN, "firmware"))
+    return domain_data[DATA_FIRMWARE_CACHE]
+
+
+class FirmwareCache:
+    """Firmware images stored as <sha256>.bin, indexed by version, pruned LRU by size."""
+
+    def __init__(self, hass, directory, max_bytes=FIRMWARE_CACHE_MAX_BYTES):
+        """Initialize."""
+        self.hass = hass
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._index = None
+        self._load_lock = asyncio.Lock()
+        self._downloads = {}
+
+    async def async_load(self):
+        """Load the index once."""
+        async with self._load_lock:
+            if self._index is None:
+                self._index = (await self._store.async_load()) or {}
+
+    def _path(self, sha256):
+        """Return the file for a hash."""
+        return os.path.join(self.directory, f"{sha256}.bin")
+
+    async def async_lookup(self, version, sha256=None):
+        """Return the cache entry for a version (and hash, if known) or None."""
+        await self.async_load()
+        entry = self._index.get(version)
+        if entry is None or (sha256 is not None and entry["sha256"] != sha256):
+            return None
+        if not await self.hass.async_add_executor_job(os.path.isfile, self._path(entry["sha256"])):
+            self._index.pop(version, None)
+            self._async_save()
+            return None
+        entry["last_used"] = time.time()
+        self._async_save()
+        return entry
+
+    async def async_acquire(self, version, sha256=None):
+        """Return the cached entry, or None after claiming the download of this version.
+
+        Concurrent installs of a version that is not cached yet wait for the
+        first one's download instead of fetching it again.
+        """
+        while True:
+            future = self._downloads.get(version)
+            if future is not None:
+                await asyncio.shield(future)
+                continue
+            entry = await self.async_lookup(version, sha256)
+            if entry is not None:
+                return entry
+            if version not in self._downloads:
+                self._downloads[version] = self.hass.loop.create_future()
+                return None
+
+    @callback
+    def async_release(self, version):
+        """End a claimed download and wake up everyone waiting for it."""
+        future = self._downloads.pop(version, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    async def async_read(self, entry):
+        """Yield a cached image in chunks; the caller verifies the hash while streaming."""
+        path = self._path(entry["sha256"])
+        handle = await self.hass.async_add_executor_job(open, path, "rb")
+        try:
+            while chunk := await self.hass.async_add_executor_job(handle.read, CHUNK_SIZE):
+                yield chunk
+        finally:
+            await self.hass.async_add_executor_job(handle.close)
+
+    @callback
+    def async_invalidate(self, entry):
+        """Drop an entry whose file failed verification."""
+        for version, cached in list(self._index.items()):
+            if cached["sha256"] == entry["sha256"]:
+                self._index.pop(version)
+        self._async_save()
+        self.hass.async_add_executor_job(_remove_file, self._path(entry["sha256"]))
+
+    async def async_tee(self, version, chunks, expected=None):
+        """Pass a claimed download through while writing it into the cache.
+
+        The image is committed as soon as the download is complete (and matched
+        the expected hash), before the last chunk is handed on, so waiting
+        installs of the same version can start reading from disk right away.
+        """
+        await self.hass.async_add_executor_job(os.makedirs, self.directory, 0o755, True)
+        tmp_path = os.path.join(self.directory, f".{uuid.uuid4().hex}.part")
+        handle = await self.hass.async_add_executor_job(open, tmp_path, "wb")
+        digest = hashlib.sha256()
+        size = 0
+        committed = False
+        held = None
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                await self.hass.async_add_executor_job(handle.write, chunk)
+                if held is not None:
+                    yield held
+                held = chunk
+            await self.hass.async_add_executor_job(handle.close)
+
+            sha256 = digest.hexdigest()
+            if expected is None or sha256 == expected:
+                await self.hass.async_add_executor_job(os.replace, tmp_path, self._path(sha256))
+                self._index[version] = {"sha256": sha256, "size": size, "last_used": time.time()}
+                committed = True
+                await self._async_prune()
+                _LOGGER.debug("Firmware %s (%s) im Cache abgelegt", version, sha256)
+            self.async_release(version)
+            if held is not None:
+                yield held
+        finally:
+            if not handle.closed:
+                await self.hass.async_add_executor_job(handle.close)
+            if not committed:
+                await self.hass.async_add_executor_job(_remove_file, tmp_path)
+            self.async_release(version)
+
+    async def _async_prune(self):
+        """Drop least recently used images until the cache fits into max_bytes."""
+        total = sum(entry["size"] for entry in self._index.values())
+        for version, entry in sorted(self._index.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes or len(self._index) <= 1:
+                break
+            self._index.pop(version)
+            if not any(other["sha256"] == entry["sha256"] for other in self._index.values()):
+                await self.hass.async_add_executor_job(_remove_file, self._path(entry["sha256"]))
+            total -= entry["size"]
+            _LOGGER.debug("Firmware %s aus dem Cache entfernt", version)
+        self._async_save()
+
+    @callback
+    def _async_save(self):
+        """Persist the index (debounced)."""
+        self._store.async_delay_save(lambda: self._index, 10)
+
+
+def _remove_file(path):
+    """Remove a file if it exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
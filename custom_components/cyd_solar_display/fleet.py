@@ -0,0 +1,125 @@
+"""Fleet firmware rollout for the CYD Solar Display integration."""
+import asyncio
+import logging
+import time
+
+from homeassistant.core import callback
+
+from .const import (
+    DOMAIN,
+    DEFAULT_FLEET_CONCURRENCY,
+    DEFAULT_FLEET_CANARIES,
+    DEFAULT_FLEET_TIMEOUT,
+    DEFAULT_FLEET_MAX_FAILURE_RATE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_UPDATE_ENTITIES = "update_entities"
+
+
+@callback
+def async_register_update_entity(hass, entity):
+    """Make an update entity available to fleet rollouts, returns the unregister callback."""
+    entities = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_UPDATE_ENTITIES, {})
+    entities[entity.entity_id] = entity
+
+    @callback
+    def unregister():
+        if entities.get(entity.entity_id) is entity:
+            entities.pop(entity.entity_id)
+
+    return unregister
+
+
+@callback
+def async_get_update_entities(hass):
+    """Return the registered update entities by entity_id."""
+    return hass.data.get(DOMAIN, {}).get(DATA_UPDATE_ENTITIES, {})
+
+
+async def async_rollout(
+    entities,
+    version,
+    concurrency=DEFAULT_FLEET_CONCURRENCY,
+    canaries=DEFAULT_FLEET_CANARIES,
+    timeout=DEFAULT_FLEET_TIMEOUT,
+    max_failure_rate=DEFAULT_FLEET_MAX_FAILURE_RATE,
+    force=False,
+):
+    """Update displays with bounded parallelism and return a summary.
+
+    The first `canaries` displays are updated on their own; if one of them
+    fails, the rollout stops. The rest run `concurrency` at a time until the
+    failed displays exceed `max_failure_rate` of all displays to update, then
+    no new updates are started; updates already running are left to finish.
+    An update still running after `timeout` seconds is cancelled, even
+    mid-upload; the display never gets the last chunk then and keeps its
+    current firmware.
+    """
+    started = time.monotonic()
+    succeeded = []
+    failed = {}
+    skipped = {}
+
+    pending = []
+    seen_hosts = set()
+    for entity in entities:
+        if entity.target_host in seen_hosts:
+            # The same display can show up under several config entries
+            skipped[entity.entity_id] = "duplicate"
+        elif not force and str(entity.installed_version) == str(version):
+            skipped[entity.entity_id] = "up_to_date"
+        else:
+            pending.append(entity)
+        seen_hosts.add(entity.target_host)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    aborted = False
+
+    async def update(entity):
+        nonlocal aborted
+        async with semaphore:
+            if aborted:
+                skipped[entity.entity_id] = "aborted"
+                return
+            _LOGGER.info("Fleet-Update: %s (%s) auf Version %s", entity.entity_id, entity.target_host, version)
+            try:
+                async with asyncio.timeout(timeout):
+                    await entity.async_push(version)
+            except TimeoutError:
+                failed[entity.entity_id] = f"timeout after {timeout} s"
+            except Exception as err:
+                failed[entity.entity_id] = str(err) or type(err).__name__
+            else:
+                succeeded.append(entity.entity_id)
+
+            if entity.entity_id in failed:
+                _LOGGER.warning("Fleet-Update für %s fehlgeschlagen: %s", entity.entity_id, failed[entity.entity_id])
+                # Against the planned total, so the outcome does not depend on which display fails first
+                if len(failed) / len(pending) > max_failure_rate and not aborted:
+                    aborted = True
+                    _LOGGER.error("Fleet-Update abgebrochen: Fehlerquote über %s", max_failure_rate)
+
+    canary_group, rest = pending[:canaries], pending[canaries:]
+    if canary_group:
+        await asyncio.gather(*(update(entity) for entity in canary_group))
+        if any(entity.entity_id in failed for entity in canary_group):
+            aborted = True
+            _LOGGER.error("Fleet-Update abgebrochen: Canary-Display fehlgeschlagen")
+    await asyncio.gather(*(update(entity) for entity in rest))
+
+    summary = {
+        "version": version,
+        "total": len(entities),
+        "succeeded": succeeded,
+        "failed": failed,
+        "skipped": skipped,
+        "aborted": aborted,
+        "duration": round(time.monotonic() - started, 1),
+    }
+    _LOGGER.info(
+        "Fleet-Update %s beendet: %s erfolgreich, %s fehlgeschlagen, %s übersprungen%s",
+        version, len(succeeded), len(failed), len(skipped), " (abgebrochen)" if aborted else "",
+    )
+    return summary
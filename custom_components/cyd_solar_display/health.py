@@ -0,0 +1,209 @@
+"""Per-display health tracking for the CYD Solar Display integration."""
+import logging
+
+from homeassistant.core import callback
+
+from .const import DOMAIN
+from .metrics import COUNTER_BLOCKED, COUNTER_SUPERSEDED
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Consecutive failed pushes before a display counts as offline
+FAILURE_THRESHOLD = 3
+# First probe after BACKOFF_BASE seconds, doubling per failed probe up to BACKOFF_MAX
+BACKOFF_BASE = 10
+BACKOFF_MAX = 300
+
+
+class CircuitBreaker:
+    """Stops pushing to a display after repeated failures and probes it with backoff."""
+
+    def __init__(self, threshold=FAILURE_THRESHOLD, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        """Initialize."""
+        self.threshold = threshold
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.backoff = 0
+        self.retry_at = None
+
+    @property
+    def available(self):
+        """Return True while pushes to the display succeed."""
+        return self.state == STATE_CLOSED
+
+    def allow(self, now):
+        """Return True if a push may go out now, the first one after the backoff is the probe."""
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN and now >= self.retry_at:
+            self.state = STATE_HALF_OPEN
+            return True
+        return False
+
+    def record_success(self):
+        """Close the breaker, returns True if the display was offline."""
+        recovered = self.state != STATE_CLOSED
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.backoff = 0
+        self.retry_at = None
+        return recovered
+
+    def record_failure(self, now):
+        """Count a failure, returns True if the breaker just opened."""
+        self.failures += 1
+        if self.state == STATE_CLOSED and self.failures < self.threshold:
+            return False
+        opened = self.state == STATE_CLOSED
+        self.state = STATE_OPEN
+        self.backoff = min(self.backoff_max, self.backoff_base * 2 ** self.opened)
+        self.opened += 1
+        self.retry_at = now + self.backoff
+        return opened
+
+    def reset(self):
+        """Allow the next push right away (e.g. the display just reconnected)."""
+        if self.state == STATE_OPEN:
+            self.retry_at = 0
+
+    def as_dict(self):
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "backoff": self.backoff,
+        }
+
+
+class DisplayChannel:
+    """Single-flight push queue of one display service.
+
+    At most one call is in flight per display. Frames arriving meanwhile wait
+    in a single slot where a newer frame replaces the queued one, so a hanging
+    display never piles up calls or stale frames. The circuit breaker decides
+    whether a call goes out at all.
+    """
+
+    def __init__(self, hass, target, send, metrics, on_change=None):
+        """Initialize."""
+        self.hass = hass
+        self.target = target
+        self._send = send
+        self._metrics = metrics
+        self._on_change = on_change
+        self.breaker = CircuitBreaker()
+        self.blocked = 0
+        self.superseded = 0
+        self._task = None
+        self._pending = None
+
+    @property
+    def busy(self):
+        """Return True while a call is in flight."""
+        return self._task is not None
+
+    @callback
+    def async_submit(self, frame, keys=None):
+        """Queue a frame, returns a future resolved once it was sent if a call started for it."""
+        if self._task is not None:
+            if self._pending is not None:
+                self._count_superseded()
+            self._pending = (frame, keys)
+            return None
+        if not self.breaker.allow(self.hass.loop.time()):
+            self._count_blocked()
+            return None
+        done = self.hass.loop.create_future()
+        task = self.hass.async_create_background_task(
+            self._async_run(frame, keys, done), f"{DOMAIN} push {self.target}"
+        )
+        # Tasks start eagerly, a call that never suspended is already done here
+        if not task.done():
+            self._task = task
+        return done
+
+    async def _async_run(self, frame, keys, done):
+        """Send the frame, then whatever frame was queued meanwhile."""
+        try:
+            while True:
+                ok = await self._send(self.target, frame, keys)
+                self._async_record(ok)
+                if not done.done():
+                    done.set_result(ok)
+                if self._pending is None:
+                    break
+                if not self.breaker.allow(self.hass.loop.time()):
+                    self._count_blocked()
+                    break
+                (frame, keys), self._pending = self._pending, None
+        finally:
+            self._task = None
+            self._pending = None
+            if not done.done():
+                done.set_result(False)
+
+    def _count_superseded(self):
+        """Count a queued frame replaced by a newer one."""
+        self.superseded += 1
+        self._metrics.count(COUNTER_SUPERSEDED)
+
+    def _count_blocked(self):
+        """Count a frame not sent because the breaker is open."""
+        self.blocked += 1
+        self._metrics.count(COUNTER_BLOCKED)
+
+    @callback
+    def _async_record(self, ok):
+        """Feed the result of a call into the breaker, log only transitions."""
+        if ok:
+            if self.breaker.record_success():
+                _LOGGER.info("Display '%s' ist wieder erreichbar", self.target)
+                self._async_notify()
+            return
+        was_open = self.breaker.state != STATE_CLOSED
+        if self.breaker.record_failure(self.hass.loop.time()):
+            _LOGGER.warning(
+                "Display '%s' nach %s Fehlern nicht erreichbar, nächster Versuch in %s s",
+                self.target, self.breaker.failures, self.breaker.backoff,
+            )
+            self._async_notify()
+        elif was_open:
+            _LOGGER.debug(
+                "Display '%s' weiterhin nicht erreichbar, nächster Versuch in %s s", self.target, self.breaker.backoff
+            )
+
+    @callback
+    def _async_notify(self):
+        """Report an availability change."""
+        if self._on_change is not None:
+            self._on_change()
+
+    @callback
+    def async_reset(self):
+        """Probe the display with the next frame instead of waiting for the backoff."""
+        self.breaker.reset()
+
+    @callback
+    def async_cancel(self):
+        """Cancel the call in flight and drop the queued frame."""
+        self._pending = None
+        if self._task is not None:
+            self._task.cancel()
+
+    def as_dict(self):
+        """Return the channel state for diagnostics."""
+        return {
+            **self.breaker.as_dict(),
+            "available": self.breaker.available,
+            "busy": self.busy,
+            "blocked": self.blocked,
+            "superseded": self.superseded,
+        }
@@ -0,0 +1,108 @@
+"""Tick instrumentation for the CYD Solar Display integration."""
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Samples kept per phase / target (at a 5 s cadence roughly the last 20 minutes)
+WINDOW_SIZE = 256
+
+PHASE_TICK = "tick"
+PHASE_DISCOVERY = "discovery"
+PHASE_GATHER = "gather"
+PHASE_ROTATION = "rotation"
+PHASE_DISPATCH = "dispatch"
+
+COUNTER_PUSHES = "pushes"
+COUNTER_SKIPPED = "skipped"
+COUNTER_FAILURES = "failures"
+# Frames replaced in a display's queue / not sent because its circuit breaker is open
+COUNTER_SUPERSEDED = "superseded"
+COUNTER_BLOCKED = "blocked"
+
+
+class RollingWindow:
+    """Fixed-size ring buffer of durations with percentile summaries."""
+
+    __slots__ = ("samples",)
+
+    def __init__(self, size=WINDOW_SIZE):
+        """Initialize."""
+        self.samples = deque(maxlen=size)
+
+    def add(self, value):
+        """Record one sample."""
+        self.samples.append(value)
+
+    def percentile(self, pct):
+        """Return the nearest-rank percentile, or None without samples."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def summary(self):
+        """Return p50/p95/max in milliseconds and the sample count."""
+        if not self.samples:
+            return {"p50": None, "p95": None, "max": None, "count": 0}
+        return {
+            "p50": round(self.percentile(50) * 1000, 2),
+            "p95": round(self.percentile(95) * 1000, 2),
+            "max": round(max(self.samples) * 1000, 2),
+            "count": len(self.samples),
+        }
+
+
+class TickMetrics:
+    """Phase and per-target durations plus push counters of one coordinator."""
+
+    def __init__(self):
+        """Initialize."""
+        self.phases = {}
+        self.targets = {}
+        self.counters = {
+            COUNTER_PUSHES: 0,
+            COUNTER_SKIPPED: 0,
+            COUNTER_FAILURES: 0,
+            COUNTER_SUPERSEDED: 0,
+            COUNTER_BLOCKED: 0,
+        }
+
+    @contextmanager
+    def measure(self, phase):
+        """Time the body of a with-block as one sample of phase."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - started)
+
+    def add(self, phase, duration):
+        """Record a phase duration in seconds."""
+        window = self.phases.get(phase)
+        if window is None:
+            window = self.phases[phase] = RollingWindow()
+        window.add(duration)
+
+    def add_target(self, target, duration):
+        """Record the dispatch duration of one target in seconds."""
+        window = self.targets.get(target)
+        if window is None:
+            window = self.targets[target] = RollingWindow()
+        window.add(duration)
+
+    def count(self, counter):
+        """Increment a counter."""
+        self.counters[counter] += 1
+
+    def summary(self, phase):
+        """Return the summary of one phase."""
+        window = self.phases.get(phase)
+        return window.summary() if window else RollingWindow(0).summary()
+
+    def as_dict(self):
+        """Return all metrics for diagnostics."""
+        return {
+            "phases": {phase: window.summary() for phase, window in self.phases.items()},
+            "targets": {target: window.summary() for target, window in self.targets.items()},
+            "counters": dict(self.counters),
+        }
@@ -0,0 +1,169 @@
+"""Validated, coalesced option writes of the CYD Solar Display panel."""
+import hashlib
+import json
+import logging
+
+import voluptuous as vol
+
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.debounce import Debouncer
+
+from .const import (
+    DOMAIN,
+    INTERNAL_OPTIONS,
+    OPTIONS_WRITE_DELAY,
+    CONF_UPDATE_INTERVAL,
+    CONF_SHOW_KW,
+    CONF_AUTO_PAGE_SWITCH,
+    CONF_PAGE_INTERVAL,
+    CONF_PAGE_SWITCH_MODE,
+    CONF_PAGE_ROTATION_SOURCE,
+    CONF_THEME_COLOR,
+    CONF_BROADCAST_MODE,
+    CONF_DIM_START_TIME,
+    CONF_DIM_END_TIME,
+    CONF_DIM_BRIGHTNESS,
+    CONF_PUSH_MODE,
+    CONF_DEBOUNCE_TIME,
+    CONF_HEARTBEAT_INTERVAL,
+    CONF_DELTA_ENCODING,
+    CONF_KEYFRAME_INTERVAL,
+    CONF_PAGE_SCOPED,
+    CONF_ADAPTIVE_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_INTERVAL,
+    PUSH_MODE_EVENT,
+    PUSH_MODE_POLL,
+    PAGE_SWITCH_AUTO,
+    PAGE_SWITCH_TOUCH,
+    PAGE_SWITCH_BOTH,
+)
+from .slots import CUSTOM_SLOTS, FLOAT_SLOTS, PAGE_SLOTS
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_OPTIONS_WRITERS = "options_writers"
+
+_ENTITY = vol.Any("", cv.entity_id)
+_SECONDS = vol.All(vol.Coerce(int), vol.Range(min=1))
+_HOUR = vol.All(vol.Coerce(int), vol.Range(min=0, max=23))
+
+# Every option the panel may write; None deletes the option (JSON merge patch)
+OPTION_VALIDATORS = {
+    **{option: _ENTITY for _key, option in FLOAT_SLOTS},
+    **{entity: _ENTITY for _slot, _name, entity, _default in CUSTOM_SLOTS},
+    **{name: cv.string for _slot, name, _entity, _default in CUSTOM_SLOTS},
+    **{option: cv.boolean for _page, option, _default in PAGE_SLOTS},
+    CONF_SHOW_KW: cv.boolean,
+    CONF_AUTO_PAGE_SWITCH: cv.boolean,
+    CONF_BROADCAST_MODE: cv.boolean,
+    CONF_ADAPTIVE_INTERVAL: cv.boolean,
+    CONF_DELTA_ENCODING: cv.boolean,
+    CONF_PAGE_SCOPED: cv.boolean,
+    CONF_UPDATE_INTERVAL: _SECONDS,
+    CONF_PAGE_INTERVAL: _SECONDS,
+    CONF_MIN_INTERVAL: _SECONDS,
+    CONF_MAX_INTERVAL: _SECONDS,
+    CONF_HEARTBEAT_INTERVAL: _SECONDS,
+    CONF_KEYFRAME_INTERVAL: _SECONDS,
+    CONF_DEBOUNCE_TIME: vol.All(vol.Coerce(float), vol.Range(min=0)),
+    CONF_PUSH_MODE: vol.In([PUSH_MODE_EVENT, PUSH_MODE_POLL]),
+    CONF_PAGE_SWITCH_MODE: vol.In([PAGE_SWITCH_AUTO, PAGE_SWITCH_TOUCH, PAGE_SWITCH_BOTH]),
+    CONF_PAGE_ROTATION_SOURCE: vol.In(["ha", "display"]),
+    CONF_THEME_COLOR: cv.string,
+    CONF_DIM_START_TIME: _HOUR,
+    CONF_DIM_END_TIME: _HOUR,
+    CONF_DIM_BRIGHTNESS: vol.All(vol.Coerce(float), vol.Range(min=1, max=100)),
+}
+
+PATCH_SCHEMA = vol.Schema(
+    {vol.Optional(key): vol.Any(None, validator) for key, validator in OPTION_VALIDATORS.items()}
+)
+
+
+def merge_patch(target, patch):
+    """Apply a JSON merge patch (RFC 7396) of flat options, None removes a key."""
+    merged = dict(target)
+    for key, value in patch.items():
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = value
+    return merged
+
+
+def public_options(options):
+    """Return the options the panel sees, without the page syncs of the integration."""
+    return {key: value for key, value in options.items() if key not in INTERNAL_OPTIONS}
+
+
+def compute_etag(body):
+    """Return a strong ETag of a JSON body."""
+    digest = hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+@callback
+def async_get_options_writer(hass, entry):
+    """Return the options writer of an entry, creating it on first use."""
+    writers = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_OPTIONS_WRITERS, {})
+    if entry.entry_id not in writers:
+        writers[entry.entry_id] = OptionsWriter(hass, entry)
+    return writers[entry.entry_id]
+
+
+async def async_flush_options_writers(hass, entry_id=None):
+    """Write the pending patches of one or all entries now."""
+    writers = hass.data.get(DOMAIN, {}).get(DATA_OPTIONS_WRITERS, {})
+    for writer_id in [entry_id] if entry_id else list(writers):
+        writer = writers.pop(writer_id, None)
+        if writer is not None:
+            await writer.async_shutdown()
+
+
+class OptionsWriter:
+    """Collects panel patches and writes them as one options update per burst."""
+
+    def __init__(self, hass, entry, delay=OPTIONS_WRITE_DELAY):
+        """Initialize."""
+        self.hass = hass
+        self.entry = entry
+        self.writes = 0
+        self._patch = {}
+        self._debouncer = Debouncer(
+            hass, _LOGGER, cooldown=delay, immediate=False, function=self.async_flush
+        )
+
+    @property
+    def pending(self):
+        """Return True while a patch waits for its write."""
+        return bool(self._patch)
+
+    @property
+    def options(self):
+        """Return the options including the patches not written yet."""
+        return merge_patch(self.entry.options, self._patch)
+
+    @callback
+    def async_patch(self, patch):
+        """Queue a validated patch, the write follows after the delay."""
+        self._patch.update(patch)
+        self._debouncer.async_schedule_call()
+
+    async def async_flush(self):
+        """Write the queued patches as one options update."""
+        if not self._patch:
+            return
+        patch, self._patch = self._patch, {}
+        options = merge_patch(self.entry.options, patch)
+        if options == dict(self.entry.options):
+            return
+        self.writes += 1
+        _LOGGER.debug("Schreibe %s geänderte Optionen für '%s'", len(patch), self.entry.title)
+        self.hass.config_entries.async_update_entry(self.entry, options=options)
+
+    async def async_shutdown(self):
+        """Cancel the delayed write and write what is pending."""
+        self._debouncer.async_cancel()
+        await self.async_flush()
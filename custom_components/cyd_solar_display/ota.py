@@ -0,0 +1,147 @@
+"""Streaming firmware push for the CYD Solar Display integration."""
+import hashlib
+import logging
+
+import aiohttp
+from aiohttp.payload import AsyncIterablePayload
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import FIRMWARE_URL, FIRMWARE_CHECKSUM_URL
+from .firmware import CHUNK_SIZE, async_get_firmware_cache
+from .version import async_get_version_service, clean_version
+
+_LOGGER = logging.getLogger(__name__)
+
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=None, sock_connect=15, sock_read=60)
+
+
+class OTAError(HomeAssistantError):
+    """Firmware could not be pushed to a display."""
+
+
+class _ChecksumError(OTAError):
+    """The image did not match its SHA-256."""
+
+
+class _FirmwarePayload(AsyncIterablePayload):
+    """Streamed firmware with a known length, so the display gets a Content-Length."""
+
+    def __init__(self, value, size, **kwargs):
+        """Initialize."""
+        super().__init__(value, **kwargs)
+        self._size = size
+
+
+async def async_fetch_checksum(session):
+    """Return the published SHA-256 of the firmware, or None if none is published."""
+    try:
+        async with session.get(FIRMWARE_CHECKSUM_URL, timeout=aiohttp.ClientTimeout(total=10)) as resp:
+            if resp.status != 200:
+                return None
+            text = (await resp.text()).strip()
+    except (aiohttp.ClientError, TimeoutError) as err:
+        _LOGGER.debug("Keine Prüfsumme abrufbar: %s", err)
+        return None
+    # Accept plain "<hash>" as well as sha256sum output "<hash>  <file>"
+    return text.split()[0].lower() if text else None
+
+
+async def async_push_firmware(hass, host, version, progress_callback=None):
+    """Push a firmware version to the display's /update endpoint.
+
+    FIRMWARE_URL always serves the published release, so only that version
+    can be installed; any other version raises instead of flashing (and
+    caching) the published image under a wrong name. The image comes from the on-disk cache when it holds this version,
+    otherwise it is streamed from GitHub and written into the cache on the
+    way through. Either way the last chunk is held back until the SHA-256
+    matched, so a corrupt image never completes and the display does not
+    reboot into it.
+    """
+    version = await _async_published_version(hass, version)
+    session = async_get_clientsession(hass)
+    cache = async_get_firmware_cache(hass)
+    expected = await async_fetch_checksum(session)
+
+    while (entry := await cache.async_acquire(version, expected)) is not None:
+        _LOGGER.info("Firmware %s aus dem Cache", version)
+        try:
+            await _async_upload(
+                session, host, cache.async_read(entry), entry["size"], entry["sha256"], progress_callback
+            )
+            return
+        except _ChecksumError:
+            _LOGGER.warning("Firmware %s im Cache ist beschädigt, lade neu herunter", version)
+            cache.async_invalidate(entry)
+
+    if expected is None:
+        _LOGGER.warning("Keine Prüfsumme für die Firmware veröffentlicht, Update wird ungeprüft gesendet")
+
+    _LOGGER.info("Lade Firmware von GitHub herunter: %s", FIRMWARE_URL)
+    try:
+        async with session.get(FIRMWARE_URL, timeout=DOWNLOAD_TIMEOUT) as download:
+            if download.status != 200:
+                raise OTAError(f"Download fehlgeschlagen (Status {download.status})")
+            chunks = cache.async_tee(version, download.content.iter_chunked(CHUNK_SIZE), expected)
+            await _async_upload(session, host, chunks, download.content_length, expected, progress_callback)
+    except aiohttp.ClientError as err:
+        raise OTAError(f"Download fehlgeschlagen: {err}") from err
+    finally:
+        cache.async_release(version)
+
+
+async def _async_published_version(hass, version):
+    """Return the version FIRMWARE_URL serves right now, raise if version is another one."""
+    service = async_get_version_service(hass)
+    await service.async_refresh(force=True)
+    published = clean_version(service.latest_version)
+    if clean_version(version) != published:
+        raise OTAError(f"Firmware {version} ist nicht verfügbar, GitHub stellt nur Version {published} bereit")
+    return published
+
+
+async def _async_upload(session, host, source, total, expected, progress_callback):
+    """Upload a chunk stream as multipart form, verifying it against expected on the way."""
+    verify_error = None
+
+    async def chunks():
+        nonlocal verify_error
+        digest = hashlib.sha256()
+        sent = 0
+        held = None
+        async for chunk in source:
+            digest.update(chunk)
+            if held is not None:
+                yield held
+                sent += len(held)
+                if progress_callback and total:
+                    progress_callback(sent, total)
+            held = chunk
+        if expected is not None and digest.hexdigest() != expected:
+            verify_error = _ChecksumError("Prüfsumme der Firmware stimmt nicht, Update abgebrochen")
+            raise verify_error
+        if held is not None:
+            yield held
+            sent += len(held)
+            if progress_callback and total:
+                progress_callback(sent, total)
+
+    payload = _FirmwarePayload(chunks(), total, content_type="application/octet-stream")
+    with aiohttp.MultipartWriter("form-data") as form:
+        part = form.append_payload(payload)
+        part.set_content_disposition("form-data", name="update", filename="firmware.bin")
+
+        upload_url = f"http://{host}/update"
+        _LOGGER.info("Pushing Firmware zu Display unter: %s", upload_url)
+        try:
+            async with session.post(upload_url, data=form, timeout=DOWNLOAD_TIMEOUT) as resp:
+                if resp.status != 200:
+                    raise OTAError(f"Push fehlgeschlagen! Status: {resp.status}. Ist der WebServer aktiv?")
+        except aiohttp.ClientError as err:
+            # A checksum mismatch inside chunks() surfaces here as a client error
+            if verify_error is not None:
+                raise verify_error from None
+            raise OTAError(f"Push fehlgeschlagen: {err}") from err
+        finally:
+            await source.aclose()
@@ -0,0 +1,104 @@
+"""On-demand cProfile capture for the CYD Solar Display integration."""
+import asyncio
+import cProfile
+import logging
+import os
+import pstats
+import time
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DOMAIN, PROFILE_MAX_FILES
+
+_LOGGER = logging.getLogger(__name__)
+
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+
+_PROFILE_LOCK = "profile_lock"
+
+
+def _profile_lock(hass):
+    """Return the lock that allows one capture at a time (cProfile cannot nest)."""
+    return hass.data.setdefault(DOMAIN, {}).setdefault(_PROFILE_LOCK, asyncio.Lock())
+
+
+async def async_profile(hass, coordinators, refreshes, ota_entity=None, top=20, sort="cumulative"):
+    """Profile the next refreshes of coordinators (and an optional OTA install).
+
+    cProfile hooks the event loop thread, so everything running on the loop
+    meanwhile is captured, including the ESPHome service dispatch. The stats
+    are written to <config>/cyd_solar_display/profiles/ for snakeviz & co.;
+    only the newest PROFILE_MAX_FILES dumps are kept.
+    """
+    lock = _profile_lock(hass)
+    if lock.locked():
+        raise HomeAssistantError("Es läuft bereits eine Profiling-Sitzung")
+
+    async with lock:
+        profiler = cProfile.Profile()
+        started = time.monotonic()
+        try:
+            profiler.enable()
+        except ValueError as err:
+            # Only one profiler per thread, e.g. HA's profiler integration is running
+            raise HomeAssistantError(
+                f"Profiling nicht möglich, es ist bereits ein anderer Profiler aktiv: {err}"
+            ) from err
+        try:
+            for _ in range(refreshes):
+                for coordinator in coordinators:
+                    await coordinator.async_refresh()
+            if ota_entity is not None:
+                await ota_entity.async_push(ota_entity.latest_version)
+        finally:
+            profiler.disable()
+        duration = time.monotonic() - started
+
+    path = hass.config.path(DOMAIN, "profiles", f"profile_{int(time.time())}.prof")
+    summary = await hass.async_add_executor_job(_write_stats, profiler, path, top, sort)
+    _LOGGER.info("Profil gespeichert: %s", path)
+    return {
+        "path": path,
+        "duration": round(duration, 3),
+        "refreshes": refreshes * len(coordinators),
+        "top": summary,
+    }
+
+
+def _write_stats(profiler, path, top, sort):
+    """Dump the stats file and return the top entries (runs in the executor)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    profiler.dump_stats(path)
+    _prune_profiles(os.path.dirname(path))
+
+    stats = pstats.Stats(profiler)
+    stats.sort_stats(sort)
+    summary = []
+    for func in stats.fcn_list[:top]:
+        _cc, ncalls, tottime, cumtime, _callers = stats.stats[func]
+        filename, line, name = func
+        summary.append(
+            {
+                "function": f"{os.path.basename(filename)}:{line}({name})" if line else name,
+                "ncalls": ncalls,
+                "tottime": round(tottime, 6),
+                "cumtime": round(cumtime, 6),
+            }
+        )
+    return summary
+
+
+def _prune_profiles(directory, keep=PROFILE_MAX_FILES):
+    """Delete the oldest profile dumps beyond keep (runs in the executor)."""
+    dumps = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.startswith("profile_") and entry.name.endswith(".prof")),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True,
+    )
+    for entry in dumps[keep:]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+        else:
+            _LOGGER.debug("Altes Profil entfernt: %s", entry.path)
@@ -0,0 +1,272 @@
+"""Cached lookups of ESPHome devices and services for the CYD Solar Display integration."""
+import logging
+from dataclasses import dataclass
+
+from homeassistant.config_entries import SIGNAL_CONFIG_ENTRY_CHANGED, ConfigEntryChange
+from homeassistant.const import ATTR_DOMAIN, EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_HOST, CONF_BROADCAST_MODE
+from .delta import delta_service_name
+
+GENERIC_SERVICE = "cyd_solar_display_update_display"
+
+RESOLUTION_SPECIFIC = "specific"
+RESOLUTION_BROADCAST = "broadcast"
+RESOLUTION_FALLBACK = "fallback"
+RESOLUTION_AMBIGUOUS = "ambiguous"
+RESOLUTION_NONE = "none"
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ESPHomeDevice:
+    """The ESPHome side of one display."""
+
+    entry_id: str
+    title: str
+    name: str
+    host: str
+    update_entity_id: str | None
+    firmware_sensor_id: str | None
+    ota_service: str
+
+
+class ESPHomeDeviceResolver:
+    """Find the ESPHome config entry and update entity for a host, cached until something changes."""
+
+    def __init__(self, hass, host):
+        """Initialize."""
+        self.hass = hass
+        self.host = host
+        self._device = None
+        self._resolved = False
+        self._unsubs = []
+        self._listeners = []
+
+    @callback
+    def async_setup(self):
+        """Invalidate the cache on registry, config-entry and reconnect events."""
+        self._unsubs = [
+            self.hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_handle_registry_updated),
+            self.hass.bus.async_listen(EVENT_SERVICE_REGISTERED, self._async_handle_service_registered),
+            async_dispatcher_connect(self.hass, SIGNAL_CONFIG_ENTRY_CHANGED, self._async_handle_entry_changed),
+        ]
+
+    @callback
+    def async_shutdown(self):
+        """Remove all listeners."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def async_add_listener(self, update_callback):
+        """Call update_callback whenever the cached result is dropped."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener():
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def invalidate(self):
+        """Drop the cached result, the next lookup resolves again."""
+        self._resolved = False
+        self._device = None
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_get(self):
+        """Return the cached device, resolving it if needed."""
+        if not self._resolved:
+            self._device = self._async_resolve()
+            self._resolved = True
+        return self._device
+
+    @callback
+    def _async_resolve(self):
+        """Scan the ESPHome entries and the entity registry once."""
+        esphome_entry = next(
+            (e for e in self.hass.config_entries.async_entries("esphome") if e.data.get("host") == self.host),
+            None,
+        )
+        if esphome_entry is None:
+            _LOGGER.warning("Kein ESPHome-Gerät für Host %s gefunden. Update-Funktion eingeschränkt.", self.host)
+            return None
+
+        device_name = esphome_entry.title.lower().replace(" ", "_").replace("-", "_")
+        update_entity_id = None
+        firmware_sensor_id = None
+        ent_reg = er.async_get(self.hass)
+        for entity in er.async_entries_for_config_entry(ent_reg, esphome_entry.entry_id):
+            if entity.domain == "update" and update_entity_id is None:
+                update_entity_id = entity.entity_id
+            elif entity.domain == "sensor" and "firmware" in entity.entity_id and firmware_sensor_id is None:
+                firmware_sensor_id = entity.entity_id
+
+        _LOGGER.info(
+            "ESPHome Eintrag für %s gefunden: %s, Update-Entität: %s",
+            self.host, esphome_entry.title, update_entity_id,
+        )
+        return ESPHomeDevice(
+            entry_id=esphome_entry.entry_id,
+            title=esphome_entry.title,
+            name=esphome_entry.data.get("name", ""),
+            host=self.host,
+            update_entity_id=update_entity_id,
+            firmware_sensor_id=firmware_sensor_id,
+            ota_service=f"{device_name}_trigger_ota_update",
+        )
+
+    @callback
+    def _async_handle_registry_updated(self, event):
+        """Re-resolve when an update entity or firmware sensor of our ESPHome entry changes."""
+        device = self._device
+        if not self._resolved or device is None:
+            # Nothing cached that a registry change could make stale
+            return
+        entity_id = event.data.get("entity_id", "")
+        if not entity_id.startswith(("update.", "sensor.")):
+            return
+        cached = {device.update_entity_id, device.firmware_sensor_id} - {None}
+        if entity_id in cached or event.data.get("old_entity_id") in cached:
+            self.invalidate()
+            return
+        registry_entry = er.async_get(self.hass).async_get(entity_id)
+        if registry_entry is not None and registry_entry.config_entry_id == device.entry_id:
+            self.invalidate()
+
+    @callback
+    def _async_handle_service_registered(self, event):
+        """Re-resolve when an ESPHome device (re)connects."""
+        if event.data.get(ATTR_DOMAIN) == "esphome":
+            self.invalidate()
+
+    @callback
+    def _async_handle_entry_changed(self, change, entry):
+        """Re-resolve when an ESPHome entry is added, removed or moves to/from our host."""
+        if entry.domain != "esphome":
+            return
+        if change in (ConfigEntryChange.ADDED, ConfigEntryChange.REMOVED):
+            self.invalidate()
+        elif change == ConfigEntryChange.UPDATED:
+            cached = self._device
+            if entry.data.get("host") == self.host:
+                if cached is None or cached.entry_id != entry.entry_id or cached.title != entry.title:
+                    self.invalidate()
+            elif cached is not None and cached.entry_id == entry.entry_id:
+                self.invalidate()
+
+
+class ServiceTargetResolver:
+    """Resolve the update_display service(s) of a config entry, refreshed only on service events."""
+
+    def __init__(self, hass, entry):
+        """Initialize."""
+        self.hass = hass
+        self.entry = entry
+        self.targets = []
+        self.delta_capable = frozenset()
+        self.resolution = None
+        self.last_resolved = None
+        self._resolved = False
+        self._unsubs = []
+
+    @callback
+    def async_setup(self):
+        """Refresh the targets whenever ESPHome services come or go."""
+        self._unsubs = [
+            self.hass.bus.async_listen(EVENT_SERVICE_REGISTERED, self._async_handle_service_event),
+            self.hass.bus.async_listen(EVENT_SERVICE_REMOVED, self._async_handle_service_event),
+        ]
+
+    @callback
+    def async_shutdown(self):
+        """Remove all listeners."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    @callback
+    def invalidate(self):
+        """Resolve again on the next lookup."""
+        self._resolved = False
+
+    @callback
+    def async_get(self):
+        """Return the cached target services, resolving them if needed."""
+        if not self._resolved:
+            self._async_resolve()
+            self._resolved = True
+        return self.targets
+
+    def as_dict(self):
+        """Return the last resolution for debugging."""
+        return {
+            "targets": list(self.targets),
+            "delta_capable": sorted(self.delta_capable),
+            "resolution": self.resolution,
+            "last_resolved": self.last_resolved.isoformat() if self.last_resolved else None,
+        }
+
+    @callback
+    def _async_resolve(self):
+        """Copy the ESPHome service list once and pick the targets."""
+        esphome_services = self.hass.services.async_services().get("esphome", {})
+        target_host = self.entry.data.get(CONF_HOST)
+        targets = []
+
+        # 1. Collect all potential services
+        all_solar_services = [s for s in esphome_services if s.startswith("cyd_solar_display_") and s.endswith("_update_display")]
+        if GENERIC_SERVICE in esphome_services and GENERIC_SERVICE not in all_solar_services:
+            all_solar_services.append(GENERIC_SERVICE)
+
+        if self.entry.options.get(CONF_BROADCAST_MODE, False):
+            targets = all_solar_services
+            resolution = RESOLUTION_BROADCAST
+        else:
+            # Specific Mode: Target only the display matching the configured IP (host)
+            resolution = RESOLUTION_SPECIFIC
+            for esphome_entry in self.hass.config_entries.async_entries("esphome"):
+                if esphome_entry.data.get("host") != target_host:
+                    continue
+                for d_name in (esphome_entry.data.get("name", ""), esphome_entry.title):
+                    if d_name:
+                        srv = f"{str(d_name).lower().replace('-', '_').replace(' ', '_')}_update_display"
+                        if srv in esphome_services:
+                            targets = [srv]
+                            break
+                if targets:
+                    break
+
+        # Fallback: If specific targeting fails but only one generic service exists, use it!
+        if not targets and len(all_solar_services) == 1:
+            targets = all_solar_services
+            resolution = RESOLUTION_FALLBACK
+            _LOGGER.debug("Calling only service %s as specific match failed but 1 display exists", targets[0])
+        elif not targets and len(all_solar_services) > 1:
+            resolution = RESOLUTION_AMBIGUOUS
+            _LOGGER.error("MEHRERE DISPLAYS gefunden, aber IP/Host '%s' passt zu keinem ESPHome-Gerät! Aus Sicherheitsgründen wird nichts gesendet.", target_host)
+        elif not targets:
+            resolution = RESOLUTION_NONE
+            _LOGGER.warning(
+                "Kein CYD Solar Display in ESPHome gefunden (oder noch 'entdeckt' aber nicht hinzugefügt). "
+                "Bitte klicke in der ESPHome Integration bei den Displays auf 'Hinzufügen'."
+            )
+
+        self.targets = targets
+        self.delta_capable = frozenset(srv for srv in targets if delta_service_name(srv) in esphome_services)
+        self.resolution = resolution
+        self.last_resolved = dt_util.utcnow()
+
+    @callback
+    def _async_handle_service_event(self, event):
+        """Invalidate on ESPHome service changes only."""
+        if event.data.get(ATTR_DOMAIN) == "esphome":
+            self.invalidate()
@@ -0,0 +1,42 @@
+"""Page rotation clock for the CYD Solar Display integration."""
+from homeassistant.core import callback
+
+
+class PageRotationScheduler:
+    """Call action every interval seconds on the loop's monotonic clock.
+
+    Deadlines are start + n * interval, so flips neither drift nor depend on
+    the data refresh cadence. Deadlines missed (e.g. after a stall) are
+    skipped instead of fired in a burst.
+    """
+
+    def __init__(self, hass, interval, action):
+        """Initialize."""
+        self.hass = hass
+        self.interval = interval
+        self.action = action
+        self._next = None
+        self._handle = None
+
+    @callback
+    def async_start(self):
+        """Start the clock, the first flip is one interval from now."""
+        self.async_stop()
+        self._next = self.hass.loop.time() + self.interval
+        self._handle = self.hass.loop.call_at(self._next, self._async_fire)
+
+    @callback
+    def async_stop(self):
+        """Stop the clock."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    @callback
+    def _async_fire(self):
+        """Run the action and arm the next deadline."""
+        now = self.hass.loop.time()
+        while self._next <= now:
+            self._next += self.interval
+        self._handle = self.hass.loop.call_at(self._next, self._async_fire)
+        self.action()
@@ -0,0 +1,103 @@
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .metrics import (
+    PHASE_TICK,
+    PHASE_DISPATCH,
+    COUNTER_PUSHES,
+    COUNTER_SKIPPED,
+    COUNTER_FAILURES,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, kw_only=True)
+class CYDMetricSensorDescription(SensorEntityDescription):
+    """Describes a tick metric sensor."""
+
+    value_fn: Callable
+    attrs_fn: Callable | None = None
+
+
+def _percentile_sensor(key, phase, stat, attrs_fn=None):
+    """Describe a p50/p95/max sensor of one phase in milliseconds."""
+    return CYDMetricSensorDescription(
+        key=key,
+        translation_key=key,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda metrics: metrics.summary(phase)[stat],
+        attrs_fn=attrs_fn,
+    )
+
+
+def _counter_sensor(key, counter):
+    """Describe a push counter sensor."""
+    return CYDMetricSensorDescription(
+        key=key,
+        translation_key=key,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.counters[counter],
+    )
+
+
+SENSORS = (
+    # Carries all phases and targets, to tell HA, network and display apart
+    _percentile_sensor("tick_p50", PHASE_TICK, "p50", attrs_fn=lambda metrics: metrics.as_dict()),
+    _percentile_sensor("tick_p95", PHASE_TICK, "p95"),
+    _percentile_sensor("tick_max", PHASE_TICK, "max"),
+    _percentile_sensor("dispatch_p95", PHASE_DISPATCH, "p95"),
+    _counter_sensor("pushes", COUNTER_PUSHES),
+    _counter_sensor("skipped_pushes", COUNTER_SKIPPED),
+    _counter_sensor("push_failures", COUNTER_FAILURES),
+)
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
+    """Set up the CYD Solar diagnostic sensors."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(CYDMetricSensor(coordinator, entry, description) for description in SENSORS)
+
+
+class CYDMetricSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor for the push tick of one display (disabled by default)."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    # The metrics blob changes every tick; the recorder keeps the state only
+    _unrecorded_attributes = frozenset({"phases", "targets", "counters"})
+
+    def __init__(self, coordinator, entry, description: CYDMetricSensorDescription):
+        """Initialize."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, entry.entry_id)})
+
+    @property
+    def native_value(self):
+        """Return the current metric."""
+        return self.entity_description.value_fn(self.coordinator.metrics)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the detailed metrics, if any."""
+        if self.entity_description.attrs_fn is None:
+            return None
+        return self.entity_description.attrs_fn(self.coordinator.metrics)
@@ -0,0 +1,157 @@
+"""Services of the CYD Solar Display integration."""
+import voluptuous as vol
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    DOMAIN,
+    SERVICE_UPDATE_FLEET,
+    SERVICE_PROFILE,
+    SERVICE_RECORD_TRACE,
+    DEFAULT_FLEET_CONCURRENCY,
+    DEFAULT_FLEET_CANARIES,
+    DEFAULT_FLEET_TIMEOUT,
+    DEFAULT_FLEET_MAX_FAILURE_RATE,
+)
+from .coordinator import CYDSolarCoordinator
+from .fleet import async_get_update_entities, async_rollout
+from .profiling import SORT_KEYS, async_profile
+from .trace import async_record_trace
+from .version import async_get_version_service, clean_version
+
+ATTR_VERSION = "version"
+ATTR_CONCURRENCY = "concurrency"
+ATTR_CANARIES = "canaries"
+ATTR_TIMEOUT = "timeout"
+ATTR_MAX_FAILURE_RATE = "max_failure_rate"
+ATTR_FORCE = "force"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_REFRESHES = "refreshes"
+ATTR_OTA_ENTITY_ID = "ota_entity_id"
+ATTR_TOP = "top"
+ATTR_SORT = "sort"
+ATTR_DURATION = "duration"
+
+UPDATE_FLEET_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_VERSION): cv.string,
+        vol.Optional(ATTR_CONCURRENCY, default=DEFAULT_FLEET_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=32)
+        ),
+        vol.Optional(ATTR_CANARIES, default=DEFAULT_FLEET_CANARIES): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_FLEET_TIMEOUT): vol.All(vol.Coerce(int), vol.Range(min=30)),
+        vol.Optional(ATTR_MAX_FAILURE_RATE, default=DEFAULT_FLEET_MAX_FAILURE_RATE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_REFRESHES, default=10): vol.All(vol.Coerce(int), vol.Range(min=1, max=1000)),
+        vol.Optional(ATTR_OTA_ENTITY_ID): cv.entity_id,
+        vol.Optional(ATTR_TOP, default=20): vol.All(vol.Coerce(int), vol.Range(min=1, max=200)),
+        vol.Optional(ATTR_SORT, default=SORT_KEYS[0]): vol.In(SORT_KEYS),
+    }
+)
+
+RECORD_TRACE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_DURATION, default=600): vol.All(vol.Coerce(int), vol.Range(min=10, max=86400)),
+    }
+)
+
+
+@callback
+def async_setup_services(hass):
+    """Register the integration services (once per Home Assistant run)."""
+    if hass.services.has_service(DOMAIN, SERVICE_UPDATE_FLEET):
+        return
+
+    async def async_handle_update_fleet(call):
+        """Roll a firmware version out to all or the selected displays."""
+        registered = async_get_update_entities(hass)
+        if ATTR_ENTITY_ID in call.data:
+            unknown = [entity_id for entity_id in call.data[ATTR_ENTITY_ID] if entity_id not in registered]
+            if unknown:
+                raise ServiceValidationError(f"Keine CYD Update-Entität: {', '.join(unknown)}")
+            entities = [registered[entity_id] for entity_id in call.data[ATTR_ENTITY_ID]]
+        else:
+            entities = list(registered.values())
+
+        # Only the published release can be downloaded, see ota.async_push_firmware
+        latest = async_get_version_service(hass).latest_version
+        version = call.data.get(ATTR_VERSION) or latest
+        if clean_version(version) != clean_version(latest):
+            raise ServiceValidationError(f"Nur die veröffentlichte Firmware {latest} kann installiert werden")
+        return await async_rollout(
+            entities,
+            version,
+            concurrency=call.data[ATTR_CONCURRENCY],
+            canaries=call.data[ATTR_CANARIES],
+            timeout=call.data[ATTR_TIMEOUT],
+            max_failure_rate=call.data[ATTR_MAX_FAILURE_RATE],
+            force=call.data[ATTR_FORCE],
+        )
+
+    async def async_handle_profile(call):
+        """Profile the next refreshes of one or all displays."""
+        coordinators = [
+            coordinator for entry_id, coordinator in hass.data.get(DOMAIN, {}).items()
+            if isinstance(coordinator, CYDSolarCoordinator)
+            and call.data.get(ATTR_CONFIG_ENTRY_ID, entry_id) == entry_id
+        ]
+        if not coordinators:
+            raise ServiceValidationError("Kein passendes CYD Display gefunden")
+
+        ota_entity = None
+        if ATTR_OTA_ENTITY_ID in call.data:
+            ota_entity = async_get_update_entities(hass).get(call.data[ATTR_OTA_ENTITY_ID])
+            if ota_entity is None:
+                raise ServiceValidationError(f"Keine CYD Update-Entität: {call.data[ATTR_OTA_ENTITY_ID]}")
+
+        return await async_profile(
+            hass,
+            coordinators,
+            call.data[ATTR_REFRESHES],
+            ota_entity=ota_entity,
+            top=call.data[ATTR_TOP],
+            sort=call.data[ATTR_SORT],
+        )
+
+    async def async_handle_record_trace(call):
+        """Record the source states and pushes of one display to a trace file."""
+        coordinator = hass.data.get(DOMAIN, {}).get(call.data[ATTR_CONFIG_ENTRY_ID])
+        if not isinstance(coordinator, CYDSolarCoordinator):
+            raise ServiceValidationError("Kein passendes CYD Display gefunden")
+        return await async_record_trace(hass, coordinator, call.data[ATTR_DURATION])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_UPDATE_FLEET,
+        async_handle_update_fleet,
+        schema=UPDATE_FLEET_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD_TRACE,
+        async_handle_record_trace,
+        schema=RECORD_TRACE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
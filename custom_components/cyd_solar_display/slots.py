@@ -0,0 +1,279 @@
+"""Compiled slot plan for the CYD Solar Display frame."""
+from typing import NamedTuple
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, STATE_UNAVAILABLE, STATE_UNKNOWN
+
+from .const import (
+    CONF_SOLAR_ENTITY,
+    CONF_GRID_ENTITY,
+    CONF_HOUSE_ENTITY,
+    CONF_BATTERY_ENTITY,
+    CONF_BATTERY_SOC_ENTITY,
+    CONF_YIELD_TODAY_ENTITY,
+    CONF_YIELD_MONTH_ENTITY,
+    CONF_YIELD_YEAR_ENTITY,
+    CONF_YIELD_TOTAL_ENTITY,
+    CONF_GRID_IMPORT_ENTITY,
+    CONF_GRID_EXPORT_ENTITY,
+    CONF_CUSTOM1_NAME, CONF_CUSTOM1_ENTITY,
+    CONF_CUSTOM2_NAME, CONF_CUSTOM2_ENTITY,
+    CONF_CUSTOM3_NAME, CONF_CUSTOM3_ENTITY,
+    CONF_CUSTOM4_NAME, CONF_CUSTOM4_ENTITY,
+    CONF_CUSTOM5_NAME, CONF_CUSTOM5_ENTITY,
+    CONF_CUSTOM6_NAME, CONF_CUSTOM6_ENTITY,
+    CONF_CUSTOM7_NAME, CONF_CUSTOM7_ENTITY,
+    CONF_CUSTOM8_NAME, CONF_CUSTOM8_ENTITY,
+    CONF_MINING1_NAME, CONF_MINING1_ENTITY,
+    CONF_MINING2_NAME, CONF_MINING2_ENTITY,
+    CONF_MINING3_NAME, CONF_MINING3_ENTITY,
+    CONF_MINING4_NAME, CONF_MINING4_ENTITY,
+    CONF_CUSTOM9_NAME, CONF_CUSTOM9_ENTITY,
+    CONF_CUSTOM10_NAME, CONF_CUSTOM10_ENTITY,
+    CONF_CUSTOM11_NAME, CONF_CUSTOM11_ENTITY,
+    CONF_CUSTOM12_NAME, CONF_CUSTOM12_ENTITY,
+    CONF_CUSTOM13_NAME, CONF_CUSTOM13_ENTITY,
+    CONF_CUSTOM14_NAME, CONF_CUSTOM14_ENTITY,
+    CONF_CUSTOM15_NAME, CONF_CUSTOM15_ENTITY,
+    CONF_CUSTOM16_NAME, CONF_CUSTOM16_ENTITY,
+    CONF_CUSTOM17_NAME, CONF_CUSTOM17_ENTITY,
+    CONF_CUSTOM18_NAME, CONF_CUSTOM18_ENTITY,
+    CONF_CUSTOM19_NAME, CONF_CUSTOM19_ENTITY,
+    CONF_CUSTOM20_NAME, CONF_CUSTOM20_ENTITY,
+    CONF_CUSTOM21_NAME, CONF_CUSTOM21_ENTITY,
+    CONF_CUSTOM22_NAME, CONF_CUSTOM22_ENTITY,
+    CONF_CUSTOM23_NAME, CONF_CUSTOM23_ENTITY,
+    CONF_CUSTOM24_NAME, CONF_CUSTOM24_ENTITY,
+    CONF_ENABLE_PAGE1,
+    CONF_ENABLE_PAGE2,
+    CONF_ENABLE_PAGE3,
+    CONF_ENABLE_PAGE4,
+    CONF_ENABLE_PAGE5,
+    CONF_ENABLE_PAGE6,
+    CONF_ENABLE_PAGE7,
+    CONF_ENABLE_PAGE8,
+    CONF_ENABLE_PAGE9,
+    CONF_SHOW_KW,
+    CONF_DIM_START_TIME,
+    CONF_DIM_END_TIME,
+    CONF_DIM_BRIGHTNESS,
+    CONF_PAGE_INTERVAL,
+    CONF_PAGE_SWITCH_MODE,
+    CONF_PAGE_ROTATION_SOURCE,
+    CONF_PAGE_SCOPED,
+    PAGE_SWITCH_AUTO,
+    PAGE_SWITCH_TOUCH,
+    DEFAULT_PAGE_INTERVAL,
+)
+
+_INVALID_STATES = (STATE_UNAVAILABLE, STATE_UNKNOWN)
+
+# (output key, option key) of the numeric energy values
+FLOAT_SLOTS = (
+    ("solar", CONF_SOLAR_ENTITY),
+    ("grid", CONF_GRID_ENTITY),
+    ("house", CONF_HOUSE_ENTITY),
+    ("bat_w", CONF_BATTERY_ENTITY),
+    ("bat_soc", CONF_BATTERY_SOC_ENTITY),
+    ("val_yield", CONF_YIELD_TODAY_ENTITY),
+    ("val_yield_month", CONF_YIELD_MONTH_ENTITY),
+    ("val_yield_year", CONF_YIELD_YEAR_ENTITY),
+    ("val_yield_total", CONF_YIELD_TOTAL_ENTITY),
+    ("grid_in", CONF_GRID_IMPORT_ENTITY),
+    ("grid_out", CONF_GRID_EXPORT_ENTITY),
+)
+
+# (display slot, name option, entity option, default name) of the 28 custom sensors
+CUSTOM_SLOTS = (
+    (1, CONF_CUSTOM1_NAME, CONF_CUSTOM1_ENTITY, "Custom 1"),
+    (2, CONF_CUSTOM2_NAME, CONF_CUSTOM2_ENTITY, "Custom 2"),
+    (3, CONF_CUSTOM3_NAME, CONF_CUSTOM3_ENTITY, "Custom 3"),
+    (4, CONF_CUSTOM4_NAME, CONF_CUSTOM4_ENTITY, "Custom 4"),
+    (5, CONF_CUSTOM5_NAME, CONF_CUSTOM5_ENTITY, "Custom 5"),
+    (6, CONF_CUSTOM6_NAME, CONF_CUSTOM6_ENTITY, "Custom 6"),
+    (7, CONF_CUSTOM7_NAME, CONF_CUSTOM7_ENTITY, "Custom 7"),
+    (8, CONF_CUSTOM8_NAME, CONF_CUSTOM8_ENTITY, "Custom 8"),
+    (9, CONF_MINING1_NAME, CONF_MINING1_ENTITY, "Mining 1"),
+    (10, CONF_MINING2_NAME, CONF_MINING2_ENTITY, "Mining 2"),
+    (11, CONF_MINING3_NAME, CONF_MINING3_ENTITY, "Mining 3"),
+    (12, CONF_MINING4_NAME, CONF_MINING4_ENTITY, "Mining 4"),
+    (13, CONF_CUSTOM9_NAME, CONF_CUSTOM9_ENTITY, "Custom 9"),
+    (14, CONF_CUSTOM10_NAME, CONF_CUSTOM10_ENTITY, "Custom 10"),
+    (15, CONF_CUSTOM11_NAME, CONF_CUSTOM11_ENTITY, "Custom 11"),
+    (16, CONF_CUSTOM12_NAME, CONF_CUSTOM12_ENTITY, "Custom 12"),
+    (17, CONF_CUSTOM13_NAME, CONF_CUSTOM13_ENTITY, "Custom 13"),
+    (18, CONF_CUSTOM14_NAME, CONF_CUSTOM14_ENTITY, "Custom 14"),
+    (19, CONF_CUSTOM15_NAME, CONF_CUSTOM15_ENTITY, "Custom 15"),
+    (20, CONF_CUSTOM16_NAME, CONF_CUSTOM16_ENTITY, "Custom 16"),
+    (21, CONF_CUSTOM17_NAME, CONF_CUSTOM17_ENTITY, "Custom 17"),
+    (22, CONF_CUSTOM18_NAME, CONF_CUSTOM18_ENTITY, "Custom 18"),
+    (23, CONF_CUSTOM19_NAME, CONF_CUSTOM19_ENTITY, "Custom 19"),
+    (24, CONF_CUSTOM20_NAME, CONF_CUSTOM20_ENTITY, "Custom 20"),
+    (25, CONF_CUSTOM21_NAME, CONF_CUSTOM21_ENTITY, "Custom 21"),
+    (26, CONF_CUSTOM22_NAME, CONF_CUSTOM22_ENTITY, "Custom 22"),
+    (27, CONF_CUSTOM23_NAME, CONF_CUSTOM23_ENTITY, "Custom 23"),
+    (28, CONF_CUSTOM24_NAME, CONF_CUSTOM24_ENTITY, "Custom 24"),
+)
+
+# (page number, option key, default) of the page toggles
+PAGE_SLOTS = (
+    (1, CONF_ENABLE_PAGE1, True),
+    (2, CONF_ENABLE_PAGE2, True),
+    (3, CONF_ENABLE_PAGE3, True),
+    (4, CONF_ENABLE_PAGE4, True),
+    (5, CONF_ENABLE_PAGE5, True),
+    (6, CONF_ENABLE_PAGE6, False),
+    (7, CONF_ENABLE_PAGE7, False),
+    (8, CONF_ENABLE_PAGE8, False),
+    (9, CONF_ENABLE_PAGE9, False),
+)
+
+# Fields every push carries, whatever page is visible
+CORE_FIELDS = (
+    "auto_rotate", "page_total", "show_kw", "page_num", "page_idx", "dim_start", "dim_end", "dim_brt",
+    *(f"p{page}_en" for page, _option, _default in PAGE_SLOTS),
+)
+
+
+def _custom_fields(first, last):
+    """Return the name/value fields of the custom slots first..last."""
+    return tuple(f"c{idx}_{suffix}" for idx in range(first, last + 1) for suffix in ("n", "v"))
+
+
+# Fields rendered by each page of the display
+PAGE_FIELDS = {
+    1: ("solar", "grid", "house", "bat_w", "bat_soc"),
+    2: ("val_yield", "val_yield_month", "val_yield_year", "val_yield_total", "grid_in", "grid_out"),
+    3: _custom_fields(1, 4),
+    4: _custom_fields(5, 8),
+    5: _custom_fields(9, 12),
+    6: _custom_fields(13, 16),
+    7: _custom_fields(17, 20),
+    8: _custom_fields(21, 24),
+    9: _custom_fields(25, 28),
+}
+
+
+def format_float(state):
+    """Format a power/energy state as a float rounded to one decimal."""
+    try:
+        return round(float(state.state), 1)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def format_custom(state):
+    """Format a custom sensor state as '<value> <unit>'."""
+    val = state.state
+    try:
+        fval = float(val)
+        if fval.is_integer():
+            val = f"{int(fval)}"
+        else:
+            val = f"{round(fval, 2)}"
+    except ValueError:
+        pass
+    unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT, "")
+    return f"{val} {unit}".strip() or " "
+
+
+class Slot(NamedTuple):
+    """One live value of the frame."""
+
+    key: str
+    entity_id: str
+    formatter: object
+    default: object
+
+
+class SlotPlan:
+    """Everything the tick needs from the options, resolved once."""
+
+    __slots__ = (
+        "options",
+        "slots",
+        "static",
+        "entity_ids",
+        "enabled_pages",
+        "switch_mode",
+        "rotation_source",
+        "page_interval",
+        "page_scoped",
+        "page_keys",
+    )
+
+    def __init__(self, options):
+        """Compile the plan for a set of options."""
+        self.options = options
+
+        slots = []
+        static = {}
+        for key, option in FLOAT_SLOTS:
+            entity_id = options.get(option)
+            if entity_id:
+                slots.append(Slot(key, entity_id, format_float, 0.0))
+            else:
+                static[key] = 0.0
+
+        self.switch_mode = options.get(CONF_PAGE_SWITCH_MODE, PAGE_SWITCH_AUTO)
+        self.rotation_source = options.get(CONF_PAGE_ROTATION_SOURCE, "ha")
+        try:
+            # Entries saved before the options flow validated it may hold 0 or less
+            self.page_interval = max(1, int(options.get(CONF_PAGE_INTERVAL, DEFAULT_PAGE_INTERVAL)))
+        except (ValueError, TypeError):
+            self.page_interval = DEFAULT_PAGE_INTERVAL
+
+        enabled = [page for page, option, default in PAGE_SLOTS if options.get(option, default)]
+        self.enabled_pages = tuple(enabled) or (1,)
+
+        static["auto_rotate"] = bool(self.rotation_source == "display" and self.switch_mode != PAGE_SWITCH_TOUCH)
+        static["page_total"] = len(self.enabled_pages)
+        static["show_kw"] = bool(options.get(CONF_SHOW_KW, False))
+
+        for idx, name_option, entity_option, default_name in CUSTOM_SLOTS:
+            static[f"c{idx}_n"] = str(options.get(name_option, default_name) or " ")
+            entity_id = options.get(entity_option)
+            if entity_id:
+                slots.append(Slot(f"c{idx}_v", entity_id, format_custom, "--"))
+            else:
+                static[f"c{idx}_v"] = " "
+
+        static["dim_start"] = int(options.get(CONF_DIM_START_TIME, 22))
+        static["dim_end"] = int(options.get(CONF_DIM_END_TIME, 6))
+        static["dim_brt"] = float(options.get(CONF_DIM_BRIGHTNESS, 20.0))
+        for page, option, default in PAGE_SLOTS:
+            static[f"p{page}_en"] = bool(options.get(option, default))
+
+        # Only safe while HA alone decides which page is visible
+        self.page_scoped = bool(
+            options.get(CONF_PAGE_SCOPED, True)
+            and self.switch_mode == PAGE_SWITCH_AUTO
+            and self.rotation_source == "ha"
+        )
+        self.page_keys = {page: (*CORE_FIELDS, *PAGE_FIELDS[page]) for page in self.enabled_pages}
+
+        self.slots = tuple(slots)
+        self.static = static
+        self.entity_ids = tuple(dict.fromkeys(slot.entity_id for slot in slots))
+
+    def sources_ready(self, states):
+        """Return True once any source entity reports a value (or none is configured)."""
+        if not self.entity_ids:
+            return True
+        get = states.get
+        for entity_id in self.entity_ids:
+            state = get(entity_id)
+            if state is not None and state.state not in _INVALID_STATES:
+                return True
+        return False
+
+    def build(self, states):
+        """Walk the plan once and return the live part of the frame."""
+        frame = dict(self.static)
+        get = states.get
+        for key, entity_id, formatter, default in self.slots:
+            state = get(entity_id)
+            if state is None or state.state in _INVALID_STATES:
+                frame[key] = default
+            else:
+                frame[key] = formatter(state)
+        return frame
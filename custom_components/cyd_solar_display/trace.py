@@ -0,0 +1,167 @@
+"""Trace recording (state changes and display pushes) for the CYD Solar Display integration."""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+
+from homeassistant.const import ATTR_DOMAIN, ATTR_SERVICE, ATTR_UNIT_OF_MEASUREMENT, EVENT_CALL_SERVICE
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .delta import delta_service_name
+
+_LOGGER = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+
+KIND_HEADER = "header"
+KIND_STATE = "state"
+KIND_CALL = "call"
+
+# Records buffered in memory before they are appended to the file
+FLUSH_EVERY = 500
+
+_RECORDING = "trace_recordings"
+
+
+async def async_record_trace(hass, coordinator, duration):
+    """Record the source states and display pushes of one coordinator for duration seconds.
+
+    The trace is gzipped NDJSON: a header with the options and targets, the
+    current state of every source entity, then one record per state change
+    and per ESPHome call, stamped with seconds since the start. It is written
+    to <config>/cyd_solar_display/traces/ and can be fed back into a
+    coordinator with benchmarks/replay_trace.py.
+    """
+    entry_id = coordinator.entry.entry_id
+    recording = hass.data.setdefault(DOMAIN, {}).setdefault(_RECORDING, set())
+    if entry_id in recording:
+        raise HomeAssistantError("Für dieses Display läuft bereits eine Aufzeichnung")
+
+    recording.add(entry_id)
+    try:
+        path = hass.config.path(DOMAIN, "traces", f"trace_{entry_id}_{int(time.time())}.ndjson.gz")
+        recorder = TraceRecorder(hass, coordinator, path)
+        await recorder.async_run(duration)
+    finally:
+        recording.discard(entry_id)
+
+    _LOGGER.info("Trace gespeichert: %s (%s Zustände, %s Aufrufe)", path, recorder.states, recorder.calls)
+    return {"path": path, "duration": duration, "states": recorder.states, "calls": recorder.calls}
+
+
+class TraceRecorder:
+    """Buffer trace records and append them to the trace file in the executor."""
+
+    def __init__(self, hass, coordinator, path):
+        """Initialize."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.path = path
+        self.states = 0
+        self.calls = 0
+        self._started = None
+        self._buffer = []
+        self._flushing = None
+
+    async def async_run(self, duration):
+        """Record for duration seconds."""
+        coordinator = self.coordinator
+        resolver = coordinator.target_resolver
+        resolver.async_get()
+
+        self._started = self.hass.loop.time()
+        self._add(
+            {
+                "kind": KIND_HEADER,
+                "version": TRACE_VERSION,
+                "started": dt_util.utcnow().isoformat(),
+                "options": dict(coordinator.entry.options),
+                "targets": list(resolver.targets),
+                "delta_capable": sorted(resolver.delta_capable),
+            }
+        )
+        entity_ids = coordinator.tracked_entity_ids
+        for entity_id in entity_ids:
+            self._add_state(entity_id, self.hass.states.get(entity_id))
+
+        unsubs = [
+            self.hass.bus.async_listen(EVENT_CALL_SERVICE, self._async_handle_call_service),
+        ]
+        if entity_ids:
+            unsubs.append(async_track_state_change_event(self.hass, entity_ids, self._async_handle_state_change))
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            while unsubs:
+                unsubs.pop()()
+            # One writer at a time, gzip members must not interleave
+            if self._flushing is not None:
+                await self._flushing
+            await self._async_flush()
+
+    @callback
+    def _async_handle_state_change(self, event):
+        """Record a source state change."""
+        self._add_state(event.data["entity_id"], event.data.get("new_state"))
+
+    @callback
+    def _async_handle_call_service(self, event):
+        """Record the ESPHome calls that go to this coordinator's displays."""
+        if event.data.get(ATTR_DOMAIN) != "esphome":
+            return
+        service = event.data.get(ATTR_SERVICE)
+        targets = self.coordinator.target_resolver.targets
+        if service not in targets and not any(service == delta_service_name(srv) for srv in targets):
+            return
+        self.calls += 1
+        self._add({"kind": KIND_CALL, "service": service, "data": dict(event.data.get("service_data") or {})})
+
+    @callback
+    def _add_state(self, entity_id, state):
+        """Record the state (or absence) of a source entity."""
+        self.states += 1
+        self._add(
+            {
+                "kind": KIND_STATE,
+                "entity_id": entity_id,
+                "state": state.state if state else None,
+                "unit": state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) if state else None,
+            }
+        )
+
+    @callback
+    def _add(self, record):
+        """Stamp and buffer a record, appending the buffer to the file when it is full."""
+        if record["kind"] != KIND_HEADER:
+            record["t"] = round(self.hass.loop.time() - self._started, 3)
+        self._buffer.append(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+        if len(self._buffer) >= FLUSH_EVERY and self._flushing is None:
+            self._flushing = self.hass.async_create_background_task(self._async_flush(), f"{DOMAIN} trace flush")
+
+    async def _async_flush(self):
+        """Append the buffered records (appended gzip members read back as one stream)."""
+        while self._buffer:
+            lines, self._buffer = self._buffer, []
+            await self.hass.async_add_executor_job(_append_lines, self.path, lines)
+        self._flushing = None
+
+
+def _append_lines(path, lines):
+    """Append lines to a gzip file (runs in the executor)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with gzip.open(path, "at", encoding="utf-8") as fp:
+        fp.writelines(lines)
+
+
+def iter_trace(path):
+    """Yield the records of a trace file, the header first (blocking)."""
+    with gzip.open(path, "rt", encoding="utf-8") as fp:
+        for line in fp:
+            if line.strip():
+                yield json.loads(line)
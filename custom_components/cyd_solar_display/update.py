@@ -1,5 +1,5 @@
-import aiohttp
 import logging
+
 from homeassistant.components.update import (
     UpdateEntity,
     UpdateEntityFeature,
@@ -7,11 +7,16 @@ from homeassistant.components.update import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .fleet import async_register_update_entity
+from .ota import OTAError, async_push_firmware
+from .resolver import ESPHomeDeviceResolver
+from .version import clean_version
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -62,7 +67,9 @@ class CYDSolarUpdateEntity(CoordinatorEntity, UpdateEntity):
 
     _attr_has_entity_name = True
     _attr_device_class = UpdateDeviceClass.FIRMWARE
-    _attr_supported_features = UpdateEntityFeature.INSTALL
+    _attr_supported_features = UpdateEntityFeature.INSTALL | UpdateEntityFeature.PROGRESS
+    _attr_in_progress = False
+    _attr_update_percentage = None
 
     def __init__(self, coordinator, entry, target_host: str, unique_id: str, title: str, device_id: str):
         """Initialize."""
@@ -71,6 +78,11 @@ class CYDSolarUpdateEntity(CoordinatorEntity, UpdateEntity):
         self._target_host = target_host
         self._attr_unique_id = unique_id
         self._attr_title = title
+        self._device_resolver = None
+        self._version_sources = (None, None)
+        self._unsub_version_source = None
+        self._installed_version = None
+        self._written = None
         
         # We try to keep it under separate devices (or all in one? Separate is cleaner)
         self._attr_device_info = DeviceInfo(
@@ -80,6 +92,87 @@ class CYDSolarUpdateEntity(CoordinatorEntity, UpdateEntity):
             model="ESP32-2432S028",
         )
 
+    async def async_added_to_hass(self):
+        """Register for fleet rollouts and follow the display's version entity."""
+        await super().async_added_to_hass()
+        self.async_on_remove(async_register_update_entity(self.hass, self))
+
+        # The source entity only changes with the registries, its state is followed by event
+        self._device_resolver = ESPHomeDeviceResolver(self.hass, self._target_host)
+        self._device_resolver.async_setup()
+        self.async_on_remove(self._device_resolver.async_shutdown)
+        self.async_on_remove(self._device_resolver.async_add_listener(self._async_track_version_source))
+        self.async_on_remove(self._async_untrack_version_source)
+        self._async_track_version_source()
+        self._written = self._shown_state()
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Write state only if something this entity shows changed, not on every telemetry tick."""
+        written = self._shown_state()
+        if written != self._written:
+            self._written = written
+            self.async_write_ha_state()
+
+    def _shown_state(self):
+        """Return what a coordinator update could change about this entity."""
+        return (self.available, self.installed_version, self.latest_version)
+
+    @callback
+    def _async_track_version_source(self):
+        """(Re-)subscribe to the ESPHome update entity and firmware sensor of this display."""
+        device = self._device_resolver.async_get()
+        sources = (device.update_entity_id, device.firmware_sensor_id) if device else (None, None)
+        if sources != self._version_sources:
+            self._async_untrack_version_source()
+            self._version_sources = sources
+            entity_ids = [entity_id for entity_id in sources if entity_id]
+            if entity_ids:
+                self._unsub_version_source = async_track_state_change_event(
+                    self.hass, entity_ids, self._async_handle_version_source_changed
+                )
+        self._async_read_installed_version()
+
+    @callback
+    def _async_untrack_version_source(self):
+        """Stop following the version entities."""
+        if self._unsub_version_source:
+            self._unsub_version_source()
+            self._unsub_version_source = None
+
+    @callback
+    def _async_handle_version_source_changed(self, _event):
+        """Refresh the installed version when the display reports a new one."""
+        if self._async_read_installed_version():
+            self.async_write_ha_state()
+
+    @callback
+    def _async_read_installed_version(self):
+        """Read the installed version from the source entities, returns True if it changed."""
+        version = None
+        update_entity_id, sensor_id = self._version_sources
+
+        if update_entity_id:
+            state = self.hass.states.get(update_entity_id)
+            if state:
+                v = state.attributes.get("installed_version")
+                if v and v != "unknown":
+                    version = clean_version(v)
+        # Fallback: Firmware-Version Sensor (falls kein Update-Entity vorhanden)
+        if version is None and sensor_id:
+            state = self.hass.states.get(sensor_id)
+            if state and state.state not in ["unknown", "unavailable"]:
+                version = clean_version(state.state)
+
+        changed = version != self._installed_version
+        self._installed_version = version
+        return changed
+
+    @property
+    def target_host(self):
+        """Host of the display this entity updates."""
+        return self._target_host
+
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
@@ -90,45 +183,19 @@ class CYDSolarUpdateEntity(CoordinatorEntity, UpdateEntity):
     @property
     def installed_version(self):
         """Version currently in use."""
-        try:
-            from homeassistant.helpers import entity_registry as er
-            ent_reg = er.async_get(self.coordinator.hass)
-            
-            # 1. Finde den passenden ESPHome Config Entry für dieses Display (Target Host)
-            esphome_entries = self.coordinator.hass.config_entries.async_entries("esphome")
-            target_esphome = next((e for e in esphome_entries if e.data.get("host") == self._target_host), None)
-            
-            if target_esphome:
-                for entity in er.async_entries_for_config_entry(ent_reg, target_esphome.entry_id):
-                    if entity.domain == "update" and entity.platform == "esphome":
-                        state = self.coordinator.hass.states.get(entity.entity_id)
-                        if state and "installed_version" in state.attributes:
-                            v = state.attributes["installed_version"]
-                            if v and v != "unknown":
-                                import re
-                                return re.sub(r'[^\d\.]', '', str(v))
-                                
-                # 3. Fallback: Suche nach einem Firmware-Version Sensor (falls kein Update-Entity vorhanden)
-                for entity in er.async_entries_for_config_entry(ent_reg, target_esphome.entry_id):
-                    if entity.domain == "sensor" and "firmware" in entity.entity_id:
-                        state = self.coordinator.hass.states.get(entity.entity_id)
-                        if state and state.state not in ["unknown", "unavailable"]:
-                            import re
-                            return re.sub(r'[^\d\.]', '', str(state.state))
-                            
-        except Exception as e:
-            _LOGGER.debug("Fehler beim Ermitteln der Firmware für %s: %s", self._target_host, e)
-
-        # 4. Letztes Fallback: Coordinator-Daten (nur als Fallback-Wert 1.2.7)
-        return str(self.coordinator.data.get("installed_version", "1.2.7")).strip().lstrip("vV")
+        if self._installed_version:
+            return self._installed_version
+
+        # Letztes Fallback: Coordinator-Daten (nur als Fallback-Wert 1.2.7)
+        data = self.coordinator.data or {}
+        return str(data.get("installed_version", "1.2.7")).strip().lstrip("vV")
 
     @property
     def latest_version(self):
         """Latest version available for install."""
         v = self.coordinator.latest_version
         if v:
-            import re
-            return re.sub(r'[^\d\.]', '', str(v))
+            return clean_version(v)
         return v
 
     @property
@@ -141,49 +208,42 @@ class CYDSolarUpdateEntity(CoordinatorEntity, UpdateEntity):
         if i_ver != l_ver:
             return "on"
         return "off"
-    @property
-    def in_progress(self):
-        """Update installation in progress."""
-        return self.coordinator.data.get("update_in_progress", False)
 
     async def async_install(self, version: str, backup: bool, **kwargs):
         """Install an update using the ESPHome web server via Direct Push."""
         _LOGGER.info("USER-ACTION: Direct-Push Update gestartet für Version %s (Host: %s)", version, self._target_host)
-        
-        if not self._target_host:
-            _LOGGER.error("FEHLER: Keine Host-IP für das Display gefunden!")
-            return
 
-        # 1. URL zur Datei auf GitHub
-        update_url = "https://raw.githubusercontent.com/low-streaming/cyd_solar_display/main/cyd_solar_display.bin"
-        
         try:
-            # 2. Download der Binary von GitHub
-            _LOGGER.info("Lade Firmware von GitHub herunter: %s", update_url)
-            async with aiohttp.ClientSession() as session:
-                async with session.get(update_url) as resp:
-                    if resp.status != 200:
-                        _LOGGER.error("Download fehlgeschlagen (Status %s)", resp.status)
-                        return
-                    binary_data = await resp.read()
-            
-            # 3. Upload zum Display (ESPHome WebServer /update endpoint)
-            upload_url = f"http://{self._target_host}/update"
-            _LOGGER.info("Pushing Firmware zu Display unter: %s", upload_url)
-            
-            data = aiohttp.FormData()
-            data.add_field('update', 
-                           binary_data,
-                           filename='firmware.bin',
-                           content_type='application/octet-stream')
-                           
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(upload_url, data=data) as resp:
-                    if resp.status == 200:
-                        _LOGGER.info("Update erfolgreich gesendet! Display startet neu.")
-                    else:
-                        _LOGGER.error("Push fehlgeschlagen! Status: %s. Ist der WebServer aktiv?", resp.status)
-
+            await self.async_push(version or self.latest_version)
+            _LOGGER.info("Update erfolgreich gesendet! Display startet neu.")
+        except OTAError as err:
+            _LOGGER.error("%s", err)
         except Exception as err:
             _LOGGER.error("Kritischer Fehler beim Update-Push: %s", err)
+
+    async def async_push(self, version: str):
+        """Push a firmware version to this display, raises on failure."""
+        if not self._target_host:
+            raise OTAError("FEHLER: Keine Host-IP für das Display gefunden!")
+        if self._attr_in_progress:
+            raise OTAError(f"Update für {self._target_host} läuft bereits")
+
+        self._attr_in_progress = True
+        self._attr_update_percentage = 0
+        self.async_write_ha_state()
+
+        try:
+            # Download von GitHub und Upload zum Display laufen gleichzeitig (gestreamt)
+            await async_push_firmware(self.hass, self._target_host, version, self._async_report_progress)
+        finally:
+            self._attr_in_progress = False
+            self._attr_update_percentage = None
+            self.async_write_ha_state()
+
+    @callback
+    def _async_report_progress(self, sent, total):
+        """Publish the upload progress in whole percent steps."""
+        percentage = min(100, int(sent * 100 / total))
+        if percentage != self._attr_update_percentage:
+            self._attr_update_percentage = percentage
+            self.async_write_ha_state()
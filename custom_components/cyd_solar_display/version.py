@@ -0,0 +1,161 @@
+"""Domain-wide latest firmware version lookup for the CYD Solar Display integration."""
+import asyncio
+import logging
+import re
+import time
+
+import aiohttp
+
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, VERSION_URL, DEFAULT_VERSION_CHECK_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_VERSION_SERVICE = "version_service"
+
+# Backoff after failed checks: 60 s, 120 s, 240 s ... capped at the check interval
+BACKOFF_BASE = 60
+REQUEST_TIMEOUT = 10
+
+_NON_VERSION_CHARS = re.compile(r"[^\d\.]")
+
+
+def clean_version(version):
+    """Strip everything but digits and dots (e.g. 'v1.2.8 (ESPHome)' -> '1.2.8')."""
+    return _NON_VERSION_CHARS.sub("", str(version))
+
+
+@callback
+def async_get_version_service(hass):
+    """Return the shared version service, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_VERSION_SERVICE not in domain_data:
+        domain_data[DATA_VERSION_SERVICE] = FirmwareVersionService(hass)
+    return domain_data[DATA_VERSION_SERVICE]
+
+
+class FirmwareVersionService:
+    """Fetch version.txt for all entries: shared session, ETag, single-flight and backoff."""
+
+    def __init__(self, hass, url=VERSION_URL, interval=DEFAULT_VERSION_CHECK_INTERVAL):
+        """Initialize."""
+        self.hass = hass
+        self.url = url
+        self.interval = interval
+        self.latest_version = "0.0.0"
+        self.last_check = None
+        self.failures = 0
+        self._etag = None
+        self._next_attempt = 0.0
+        self._refresh_task = None
+        self._unsub_timer = None
+        self._users = 0
+        self._listeners = []
+
+    @callback
+    def async_start(self):
+        """Register a user; the first one starts the background checks."""
+        self._users += 1
+        if self._users != 1:
+            return
+        # After a release (e.g. entry reload) the last check may be recent: wait out its window
+        remaining = self._next_attempt - time.monotonic()
+        if remaining > 0:
+            self._schedule(remaining)
+        else:
+            self.hass.async_create_background_task(self.async_refresh(), f"{DOMAIN} version check")
+
+    @callback
+    def async_release(self):
+        """Unregister a user; the last one stops the background checks."""
+        self._users = max(0, self._users - 1)
+        if self._users == 0 and self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def async_add_listener(self, update_callback):
+        """Call update_callback whenever the latest version changes."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener():
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    async def async_refresh(self, force=False):
+        """Check GitHub for a new version, returns True if the version changed.
+
+        Concurrent callers share one request. Without force, nothing happens
+        while a backoff is running.
+        """
+        task = self._refresh_task
+        if task is None:
+            if not force and time.monotonic() < self._next_attempt:
+                return False
+            task = self._refresh_task = self.hass.async_create_background_task(
+                self._async_fetch(), f"{DOMAIN} version fetch"
+            )
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._refresh_task is task and task.done():
+                self._refresh_task = None
+
+    async def _async_fetch(self):
+        """Perform one conditional request and schedule the next one."""
+        headers = {"If-None-Match": self._etag} if self._etag else {}
+        updated = False
+        try:
+            session = async_get_clientsession(self.hass)
+            async with session.get(
+                self.url, headers=headers, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+            ) as response:
+                if response.status == 304:
+                    _LOGGER.debug("GitHub version unchanged (%s)", self.latest_version)
+                elif response.status == 200:
+                    version = (await response.text()).strip()
+                    self._etag = response.headers.get("ETag")
+                    updated = version != self.latest_version
+                    self.latest_version = version
+                    _LOGGER.debug("Latest GitHub version: %s", self.latest_version)
+                else:
+                    raise aiohttp.ClientResponseError(
+                        response.request_info, response.history, status=response.status
+                    )
+        except Exception as err:
+            self.failures += 1
+            delay = min(BACKOFF_BASE * 2 ** (self.failures - 1), self.interval)
+            _LOGGER.warning("Failed to fetch version from GitHub: %s (retry in %s s)", err, delay)
+        else:
+            self.failures = 0
+            self.last_check = time.time()
+            delay = self.interval
+
+        self._next_attempt = time.monotonic() + delay
+        self._schedule(delay)
+
+        if updated:
+            for update_callback in list(self._listeners):
+                update_callback()
+        return updated
+
+    @callback
+    def _schedule(self, delay):
+        """(Re-)arm the timer for the next background check."""
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._users:
+            self._unsub_timer = async_call_later(self.hass, delay, self._async_timer_fired)
+
+    @callback
+    def _async_timer_fired(self, _now):
+        """Run a scheduled check in the background."""
+        self._unsub_timer = None
+        # The timer already waited out the backoff; the guard would drop the check and with it the next timer
+        self.hass.async_create_background_task(self.async_refresh(force=True), f"{DOMAIN} version check")
@@ -29,21 +29,42 @@ class CYDPreview extends LitElement {
     this.firmwareUpdateEntityId = "";
     this._checkingUpdate = false;
     this._pickerSearch = {};
+    // Last config version from the server, base of the next save
+    this._etag = null;
+    this._savedConfig = {};
   }
 
   firstUpdated() {
     this.loadConfig();
   }
 
+  configUrl() {
+    return `/api/cyd_solar_display/config/${this.panel.config.entry_id}`;
+  }
+
+  // GET with If-None-Match, a 304 keeps the config already loaded
+  async fetchConfig() {
+    const headers = this._etag ? { 'If-None-Match': this._etag } : {};
+    const resp = await this.hass.fetchWithAuth(this.configUrl(), { headers });
+    if (resp.status === 304) return null;
+    if (!resp.ok) throw new Error(`HTTP ${resp.status}`);
+    this._etag = resp.headers.get('ETag');
+    return resp.json();
+  }
+
+  applyConfig(data) {
+    this._savedConfig = data.config;
+    this.editConfig = JSON.parse(JSON.stringify(data.config));
+    this.latestVersion = data.latest_version || "0.0.0";
+    this.firmwareUpdateEntityId = data.firmware_update_entity_id || "";
+    this.requestUpdate();
+  }
+
   async loadConfig() {
     if (!this.panel || !this.panel.config || !this.panel.config.entry_id) return;
-    const entryId = this.panel.config.entry_id;
     try {
-      const data = await this.hass.callApi('GET', `cyd_solar_display/config/${entryId}`);
-      this.editConfig = JSON.parse(JSON.stringify(data.config));
-      this.latestVersion = data.latest_version || "0.0.0";
-      this.firmwareUpdateEntityId = data.firmware_update_entity_id || "";
-      this.requestUpdate();
+      const data = await this.fetchConfig();
+      if (data) this.applyConfig(data);
     } catch (e) { console.error("Failed to load config", e); }
   }
 
@@ -62,19 +83,67 @@ class CYDPreview extends LitElement {
     });
   }
 
+  // JSON merge patch of the edited keys, null removes a key
+  buildPatch(base) {
+    const patch = {};
+    const keys = new Set([...Object.keys(base), ...Object.keys(this.editConfig)]);
+    keys.forEach(key => {
+      if (key === 'last_page' || key === '_last_sync') return;
+      const value = this.editConfig[key];
+      if (JSON.stringify(value) === JSON.stringify(base[key])) return;
+      patch[key] = value === undefined ? null : value;
+    });
+    return patch;
+  }
+
+  sendPatch(patch) {
+    return this.hass.fetchWithAuth(this.configUrl(), {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/merge-patch+json',
+        ...(this._etag ? { 'If-Match': this._etag } : {}),
+      },
+      body: JSON.stringify(patch),
+    });
+  }
+
   async saveConfig() {
     if (!this.panel || !this.panel.config || !this.panel.config.entry_id) return;
-    const entryId = this.panel.config.entry_id;
     try {
-      const payload = { ...this.editConfig };
-      delete payload.last_page;
-      delete payload._last_sync;
-      
-      await this.hass.callApi('POST', `cyd_solar_display/config/${entryId}`, payload);
+      const base = this._savedConfig;
+      const patch = this.buildPatch(base);
+      if (Object.keys(patch).length === 0) {
+        alert("ℹ️ Keine Änderungen zum Speichern.");
+        return;
+      }
+
+      let resp = await this.sendPatch(patch);
+      if (resp.status === 412) {
+        // Changed elsewhere meanwhile: retry once if none of our keys were touched
+        this._etag = null;
+        const current = await this.fetchConfig();
+        const conflict = Object.keys(patch).some(
+          key => JSON.stringify(current.config[key]) !== JSON.stringify(base[key])
+        );
+        if (conflict) {
+          alert("⚠️ Die Einstellungen wurden zwischenzeitlich an anderer Stelle geändert. Die aktuellen Werte werden neu geladen.");
+          this.applyConfig(current);
+          return;
+        }
+        resp = await this.sendPatch(patch);
+      }
+      if (!resp.ok) {
+        const err = await resp.json().catch(() => ({}));
+        throw new Error(err.message || `HTTP ${resp.status}`);
+      }
+
+      this._etag = resp.headers.get('ETag');
+      const data = await resp.json();
+      this._savedConfig = data.config;
       alert("✅ Einstellungen wurden erfolgreich gespeichert!");
     } catch (e) {
       console.error(e);
-      alert("❌ Fehler beim Speichern der Einstellungen.");
+      alert(`❌ Fehler beim Speichern der Einstellungen: ${e.message}`);
     }
   }
 
@@ -808,6 +877,47 @@ class CYDPreview extends LitElement {
                 `}
             </div>
 
+            <div class="form-row">
+                <div class="form-group flex-1">
+                  <label>Sende-Modus</label>
+                  <select name="push_mode" .value="${this.editConfig.push_mode || 'poll'}" @change="${this.handleFormInput}">
+                    <option value="event" ?selected=${this.editConfig.push_mode === 'event'}>⚡ Bei Änderung senden</option>
+                    <option value="poll" ?selected=${(this.editConfig.push_mode || 'poll') === 'poll'}>⏱️ Festes Intervall</option>
+                  </select>
+                  <small>Ereignis-Modus sendet nur, wenn sich ein Sensor ändert.</small>
+                </div>
+                ${this.editConfig.push_mode === 'event' ? html`
+                <div class="form-group flex-1">
+                  <label>Entprell-Zeit (Sekunden)</label>
+                  <input type="number" name="debounce_time" min="0" step="0.1" .value="${this.editConfig.debounce_time !== undefined ? this.editConfig.debounce_time : 1}" @input="${this.handleFormInput}">
+                  <small>Fasst schnelle Änderungen zu einem Push zusammen.</small>
+                </div>
+                <div class="form-group flex-1">
+                  <label>Heartbeat (Sekunden)</label>
+                  <input type="number" name="heartbeat_interval" min="10" .value="${this.editConfig.heartbeat_interval || 60}" @input="${this.handleFormInput}">
+                  <small>Sicherheits-Push, auch ohne Änderung.</small>
+                </div>
+                ` : html`
+                <div class="form-group flex-1">
+                  <label>
+                    <input type="checkbox" name="adaptive_interval" .checked="${this.editConfig.adaptive_interval === true}" @change="${this.handleFormInput}">
+                    Adaptives Intervall
+                  </label>
+                  <small>Schneller bei schwankender Leistung, langsamer bei Ruhe (z.B. nachts).</small>
+                </div>
+                ${this.editConfig.adaptive_interval === true ? html`
+                <div class="form-group flex-1">
+                  <label>Minimum (Sekunden)</label>
+                  <input type="number" name="min_interval" min="1" .value="${this.editConfig.min_interval || 2}" @input="${this.handleFormInput}">
+                </div>
+                <div class="form-group flex-1">
+                  <label>Maximum (Sekunden)</label>
+                  <input type="number" name="max_interval" min="1" .value="${this.editConfig.max_interval || 60}" @input="${this.handleFormInput}">
+                </div>
+                ` : ''}
+                `}
+            </div>
+
             <div style="margin-top: 15px; margin-bottom: 20px; padding: 15px; background: rgba(0,243,255,0.05); border: 1px solid rgba(0,243,255,0.3); border-radius: 8px;">
               <label style="display: flex; align-items: flex-start; gap: 10px; cursor: pointer; color: #fff; margin: 0;">
                   <input type="checkbox" name="broadcast_mode" .checked="${this.editConfig.broadcast_mode === true}" @change="${this.handleFormInput}" style="width: 20px; height: 20px; accent-color: #00f3ff; margin-top: 3px; flex-shrink: 0;">